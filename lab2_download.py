@@ -0,0 +1,210 @@
+import os
+import re
+import time
+import threading
+import http.client
+from datetime import datetime
+from urllib.parse import urlsplit, urlencode
+from concurrent.futures import ThreadPoolExecutor
+
+base_url = "https://www.star.nesdis.noaa.gov/smcd/emb/vci/VH/get_TS_admin.php"
+indexes = {1: 22, 2: 24, 3: 23, 4: 25, 5: 3, 6: 4, 7: 8, 8: 19, 9: 20, 10: 21, 11: 9, 13: 10, 14: 11, 15: 12, 16: 13, 17: 14, 18: 15, 19: 16, 21: 17, 22: 18, 23: 6, 24: 1, 25: 2, 26: 7, 27: 5}
+
+first_year = 1981
+stamp_format = "%d-%m-%Y_%H-%M-%S"
+file_pattern = re.compile(r'^NOAA_(\d+)_(.+)\.csv$')
+tag_pattern = re.compile(r'</?(tt|pre|br)>', re.IGNORECASE)
+
+
+class RetryError(Exception):
+    pass
+
+
+# Час створення файлу: дата з імені (dd-mm-YYYY_HH-MM-SS не сортується як рядок),
+# а для імен іншого формату та однакових дат - час зміни файлу
+def file_time(directory, file_name, stamp):
+    try:
+        created = datetime.strptime(stamp, stamp_format)
+    except ValueError:
+        created = datetime.min
+    return created, os.path.getmtime(os.path.join(directory, file_name))
+
+
+# Індекс директорії: один os.listdir на весь запуск, {індекс області: ім'я файлу}
+def build_directory_index(directory):
+    index = {}
+    newest = {}
+    for file_name in os.listdir(directory):
+        match = file_pattern.match(file_name)
+        if match:
+            # якщо файлів декілька, залишаємо найсвіжіший
+            province = int(match.group(1))
+            created = file_time(directory, file_name, match.group(2))
+            if province not in newest or created > newest[province]:
+                index[province], newest[province] = file_name, created
+    return index
+
+
+# Розбиття відповіді NOAA на заголовок та рядки з даними {(рік, тиждень): рядок}
+def split_response(text):
+    header = []
+    rows = {}
+    for line in text.splitlines():
+        fields = tag_pattern.sub('', line).split(',')
+        try:
+            key = (int(fields[0]), int(fields[1]))
+        except (ValueError, IndexError):
+            if not rows and line.strip():
+                header.append(line)
+            continue
+        rows[key] = line
+    return header, rows
+
+
+def join_response(header, rows):
+    lines = header + [rows[key] for key in sorted(rows)] + ['</pre></tt>']
+    return '\n'.join(lines) + '\n'
+
+
+class NOAADownloader:
+    def __init__(self, directory, url=base_url, workers=8, retries=4, backoff=0.5, timeout=30, last_year=None):
+        self.directory = directory
+        self.url = urlsplit(url)
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.last_year = last_year or datetime.now().year
+        self.local = threading.local()
+        self.connections = []
+        self.lock = threading.Lock()
+
+    # Одне keep-alive з'єднання на потік
+    def connection(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            if self.url.scheme == 'https':
+                conn = http.client.HTTPSConnection(self.url.netloc, timeout=self.timeout)
+            else:
+                conn = http.client.HTTPConnection(self.url.netloc, timeout=self.timeout)
+            self.local.conn = conn
+            with self.lock:
+                self.connections.append(conn)
+        return conn
+
+    def drop_connection(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self.local.conn = None
+            with self.lock:
+                self.connections.remove(conn)
+
+    def close(self):
+        with self.lock:
+            for conn in self.connections:
+                conn.close()
+            self.connections = []
+
+    def request_path(self, province_id, year1):
+        query = urlencode({'country': 'UKR', 'provinceID': province_id,
+                           'year1': year1, 'year2': self.last_year, 'type': 'Mean'})
+        return self.url.path + '?' + query
+
+    # Запит з повторами та експоненційною затримкою
+    def fetch(self, province_id, year1=first_year):
+        path = self.request_path(province_id, year1)
+        for attempt in range(self.retries + 1):
+            try:
+                conn = self.connection()
+                conn.request('GET', path, headers={'Connection': 'keep-alive'})
+                response = conn.getresponse()
+                body = response.read()
+                if response.status == 200:
+                    return body.decode('utf-8', errors='replace')
+                if response.status < 500 and response.status != 429:
+                    raise RetryError(f'HTTP {response.status} для області {province_id}')
+                error = RetryError(f'HTTP {response.status} для області {province_id}')
+            except (OSError, http.client.HTTPException) as e:
+                self.drop_connection()
+                error = e
+            if attempt < self.retries:
+                time.sleep(self.backoff * 2 ** attempt)
+        raise RetryError(f'Не вдалося завантажити область {province_id}: {error}')
+
+    def file_path(self, index):
+        date_and_time = datetime.now().strftime(stamp_format)
+        return os.path.join(self.directory, 'NOAA_' + str(index) + '_' + date_and_time + '.csv')
+
+    # Запис у тимчасовий файл поруч і заміна: перерваний запуск не залишає
+    # обрізаного NOAA_*.csv, який наступний запуск вважав би наявним
+    def write(self, index, text, old_file=None):
+        file_path = self.file_path(index)
+        part_path = file_path + '.part'
+        try:
+            with open(part_path, 'w', encoding='utf-8') as out:
+                out.write(text)
+            os.replace(part_path, file_path)
+        except BaseException:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            raise
+        if old_file is not None and os.path.join(self.directory, old_file) != file_path:
+            os.remove(os.path.join(self.directory, old_file))
+        return file_path
+
+    # Завантаження однієї області: повне, або лише з останнього наявного року
+    def download_one(self, province_id, index, existing_file, refresh):
+        if existing_file is None:
+            text = self.fetch(province_id)
+            return 'created', self.write(index, text)
+        if not refresh:
+            return 'exists', os.path.join(self.directory, existing_file)
+
+        with open(os.path.join(self.directory, existing_file), encoding='utf-8') as f:
+            header, rows = split_response(f.read())
+        # останній рік може бути неповним, тому перезавантажуємо саме його
+        year1 = max((year for year, _ in rows), default=first_year)
+        _, fresh = split_response(self.fetch(province_id, year1))
+        old = {key: line for key, line in rows.items() if key[0] >= year1}
+        if fresh == old:
+            return 'unchanged', os.path.join(self.directory, existing_file)
+
+        merged = {key: line for key, line in rows.items() if key[0] < year1}
+        merged.update(fresh)
+        return 'updated', self.write(index, join_response(header, merged), existing_file)
+
+    def download_all(self, provinces=indexes, refresh=False):
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+        existing = build_directory_index(self.directory)
+        results = {}
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                futures = {
+                    index: pool.submit(self.download_one, province_id, index, existing.get(index), refresh)
+                    for province_id, index in provinces.items()
+                }
+                for index, future in futures.items():
+                    results[index] = future.result()
+        finally:
+            self.close()
+        return results
+
+
+def download_vhi(directory, refresh=False, **kwargs):
+    downloader = NOAADownloader(directory, **kwargs)
+    results = downloader.download_all(refresh=refresh)
+    for index, (status, file_path) in sorted(results.items()):
+        if status == 'exists':
+            print('Файл з індексом ' + str(index) + ' вже існує')
+        elif status == 'unchanged':
+            print('Файл з індексом ' + str(index) + ' не змінився')
+        else:
+            print('Файл ' + file_path + ' був ' + ('створений' if status == 'created' else 'оновлений'))
+    print('Успішно виконано')
+    return results
+
+
+if __name__ == '__main__':
+    download_vhi('ADlab2')
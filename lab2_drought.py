@@ -0,0 +1,114 @@
+import io
+import time
+import contextlib
+
+import numpy as np
+import pandas as pd
+
+from lab2_store import VHIStore
+
+# Діапазони VHI (нижня межа, верхня межа), обидві межі не включаються
+extreme_band = (-np.inf, 15)
+moderate_band = (15, 35)
+default_bands = {'extreme': extreme_band, 'moderate': moderate_band}
+
+group_width = 1000.0
+
+
+class DroughtAnalysis:
+    def __init__(self, store):
+        self.store = store
+        vhi = store.columns['VHI'].astype(np.float64)
+        counts = np.diff(np.append(store.group_starts, len(vhi)))
+        group_id = np.repeat(np.arange(len(counts)), counts)
+        # Значення VHI, відсортовані всередині кожної пари (область, рік);
+        # перший елемент групи - її мінімум
+        self.sorted_key = np.sort(group_id * group_width + vhi)
+        self.group_offset = np.arange(len(counts)) * group_width
+        self.group_stops = store.group_starts + counts
+        self.minimum = self.sorted_key[store.group_starts] - self.group_offset if len(vhi) else vhi
+        self.total_areas = len(store.areas)
+
+    # Чи має кожна пара (область, рік) хоча б один тиждень у діапазоні (lo, hi)
+    def affected(self, lo, hi, mode='any'):
+        if mode == 'min':
+            return (self.minimum > lo) & (self.minimum < hi)
+        lo = np.clip(lo, -group_width / 2, group_width / 2)
+        hi = np.clip(hi, -group_width / 2, group_width / 2)
+        first = np.searchsorted(self.sorted_key, self.group_offset + lo, side='right')
+        inside = first < self.group_stops
+        first = np.minimum(first, len(self.sorted_key) - 1)
+        return inside & (self.sorted_key[first] < self.group_offset + hi)
+
+    # Частка областей з посухою для кожного року і кожного діапазону
+    def share(self, bands=default_bands, mode='any'):
+        years = self.store.group_year
+        parts = []
+        for name, (lo, hi) in bands.items():
+            counts = pd.Series(self.affected(lo, hi, mode).astype(np.int64)).groupby(years).sum()
+            parts.append(pd.DataFrame({'Year': counts.index, 'band': name, 'areas': counts.to_numpy()}))
+        table = pd.concat(parts, ignore_index=True)
+        table['total_areas'] = self.total_areas
+        table['percent'] = table['areas'] / self.total_areas * 100
+        return table
+
+    def drought_years(self, band, percentage, inclusive=True, mode='any'):
+        table = self.share({'band': band}, mode)
+        mask = table['percent'] >= percentage if inclusive else table['percent'] > percentage
+        return table.loc[mask, ['Year', 'percent']].reset_index(drop=True)
+
+
+def drought_share(store, bands=default_bands, mode='any'):
+    return DroughtAnalysis(store).share(bands, mode)
+
+
+# Поточні реалізації з lab2.ipynb, залишені для порівняння
+def extreme_drought_finder(file_path, percentage):
+    dataframe = pd.read_csv(file_path)
+    total_areas = len(dataframe['Area'].unique())
+    for year in dataframe['Year'].unique():
+        drought_counter = 0
+        for area in dataframe['Area'].unique():
+            area_data = dataframe[(dataframe['Year'] == year) & (dataframe['Area'] == area)]
+            if (area_data['VHI'] < 15).any():
+                drought_counter += 1
+        perc_ext = (drought_counter / total_areas) * 100
+        if perc_ext >= percentage:
+            print(f'Рік, коли Екстримальні посухи торкнулися більше {percentage}% областей по Україні: {year}, {perc_ext}%')
+
+
+def moderate_drought_finder(file_path, percentage):
+    dataframe = pd.read_csv(file_path)
+    total_areas = len(dataframe['Area'].unique())
+    for year in dataframe['Year'].unique():
+        moderate_drought_counter = 0
+        for area in dataframe['Area'].unique():
+            area_data = dataframe[(dataframe['Year'] == year) & (dataframe['Area'] == area)]
+            if ((area_data['VHI'] < 35) & (area_data['VHI'] > 15)).any():
+                moderate_drought_counter += 1
+        perc_norm = (moderate_drought_counter / total_areas) * 100
+        if perc_norm > percentage:
+            print(f'Рік, коли Помірні посухи торкнулися більше {percentage}% областей по Україні: {year}, {perc_norm}%')
+
+
+def benchmark(file_path="EveryData.csv", extreme_percentage=10, moderate_percentage=80):
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        extreme_drought_finder(file_path, extreme_percentage)
+        moderate_drought_finder(file_path, moderate_percentage)
+        old_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    analysis = DroughtAnalysis(VHIStore.load(file_path))
+    extreme = analysis.drought_years(extreme_band, extreme_percentage)
+    moderate = analysis.drought_years(moderate_band, moderate_percentage, inclusive=False)
+    new_time = time.perf_counter() - start
+
+    print(f'Роки екстремальних посух: {extreme["Year"].tolist()}')
+    print(f'Роки помірних посух: {moderate["Year"].tolist()}')
+    print(f'Цикли по роках і областях: {old_time:.3f} с')
+    print(f'DroughtAnalysis (разом із завантаженням): {new_time:.4f} с, прискорення {old_time / new_time:.0f}x')
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,120 @@
+import io
+import os
+import re
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from timing import measure
+
+column_names = ["Year", "Week", "SMN", "SMT", "VCI", "TCI", "VHI", "Area"]
+column_types = {"Year": np.int16, "Week": np.int16, "SMN": np.float32, "SMT": np.float32,
+                "VCI": np.float32, "TCI": np.float32, "VHI": np.float32}
+store_dtype = np.dtype([(name, column_types.get(name, np.int16)) for name in column_names])
+
+file_pattern = re.compile(r'^NOAA_(\d+)_.*\.csv$')
+tag_pattern = re.compile(r'</?(tt|pre|br)>', re.IGNORECASE)
+data_line = re.compile(r'^\s*\d{4}\s*,.*$', re.MULTILINE)
+
+
+# Шлях до бінарного сховища поруч з EveryData.csv
+def store_path(output_path):
+    return os.path.splitext(output_path)[0] + '.npy'
+
+
+# Розбір одного файлу NOAA одразу в типізовані стовпці
+def parse_noaa_file(file_path):
+    with open(file_path, encoding='utf-8', errors='replace') as f:
+        text = tag_pattern.sub('', f.read())
+    body = '\n'.join(data_line.findall(text))
+    df = pd.read_csv(io.StringIO(body), header=None, names=column_names[:7], usecols=range(7),
+                     dtype=column_types, skipinitialspace=True)
+    return df[df['VHI'] != -1].dropna()
+
+
+def ingest_csv_files(data_dir, output_path=None, write_csv=True):
+    columns = {name: [] for name in column_names}
+    for filename in sorted(os.listdir(data_dir)):
+        match = file_pattern.match(filename)
+        if not match:
+            continue
+        df = parse_noaa_file(os.path.join(data_dir, filename))
+        for name in column_names[:7]:
+            columns[name].append(df[name].to_numpy())
+        columns['Area'].append(np.full(len(df), int(match.group(1)), dtype=np.int16))
+
+    # Одне з'єднання масивів замість pd.concat на кожній ітерації
+    total = sum(len(part) for part in columns['Year'])
+    table = np.empty(total, dtype=store_dtype)
+    for name in column_names:
+        if columns[name]:
+            np.concatenate(columns[name], out=table[name])
+
+    if output_path is not None:
+        np.save(store_path(output_path), table)
+        if write_csv:
+            to_frame(table).to_csv(output_path, index=False)
+    return to_frame(table)
+
+
+def to_frame(table):
+    df = pd.DataFrame({name: table[name] for name in column_names[:7]})
+    df['Area'] = pd.Categorical(table['Area'])
+    return df
+
+
+# Завантаження сховища через memory map, без розбору CSV
+def load_vhi(output_path, mmap=True):
+    table = np.load(store_path(output_path), mmap_mode='r' if mmap else None)
+    return to_frame(table)
+
+
+# Поточна реалізація з lab2.ipynb, залишена для порівняння
+def combine_csv_files(data_dir, output_path):
+    column_names = ["Year", "Week", "SMN", "SMT", "VCI", "TCI", "VHI", "Area"]
+    combined_data = pd.DataFrame(columns=column_names)
+    filenames = os.listdir(data_dir)
+
+    for filename in filenames:
+        if not filename.endswith(".csv"):
+            continue
+        file_path = os.path.join(data_dir, filename)
+        df = pd.read_csv(file_path, skiprows=2, names=column_names)
+        df["Year"] = df["Year"].str.replace('<tt><pre>', '').str.replace('</pre></tt>', '')
+        region_code = int(filename.split('_')[1])
+        df["Area"] = region_code
+        df = df.drop(df.loc[df['VHI'] == -1].index).dropna()
+        combined_data = pd.concat([combined_data, df], ignore_index=True)
+    combined_data.to_csv(output_path, index=False)
+    return combined_data
+
+
+def benchmark(data_dir=None, years=(1981, 2024)):
+    from lab2_stub_server import generate_rows, render
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if data_dir is None:
+            data_dir = os.path.join(tmp, 'noaa')
+            os.makedirs(data_dir)
+            for index in range(1, 26):
+                data = {(index, y): generate_rows(index, y, y) for y in range(years[0], years[1] + 1)}
+                with open(os.path.join(data_dir, f'NOAA_{index}_01-01-2024_00-00-00.csv'), 'w') as f:
+                    f.write(render(index, years[0], years[1], data))
+
+        output_path = os.path.join(tmp, 'EveryData.csv')
+        old, old_time, old_peak = measure(combine_csv_files, data_dir, output_path)
+        # обидва шляхи пишуть EveryData.csv; новий ще й сховище .npy
+        new, new_time, new_peak = measure(ingest_csv_files, data_dir, output_path)
+        _, load_time, load_peak = measure(load_vhi, output_path)
+
+    print(f'Рядків: {len(old)} / {len(new)}')
+    print(f'combine_csv_files: {old_time:.3f} с, пік пам\'яті {old_peak / 2**20:.1f} МБ, '
+          f'в пам\'яті {old.memory_usage(deep=True).sum() / 2**20:.1f} МБ')
+    print(f'ingest_csv_files:  {new_time:.3f} с, пік пам\'яті {new_peak / 2**20:.1f} МБ, '
+          f'в пам\'яті {new.memory_usage(deep=True).sum() / 2**20:.1f} МБ')
+    print(f'load_vhi (.npy):   {load_time:.4f} с, пік пам\'яті {load_peak / 2**20:.1f} МБ')
+
+
+if __name__ == '__main__':
+    benchmark()
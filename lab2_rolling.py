@@ -0,0 +1,163 @@
+import bisect
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+weeks_in_year = 53
+
+
+# Лінійна інтерполяція перцентиля по відсортованому вікну (як у np.percentile)
+def sorted_percentile(values, q):
+    if not values:
+        return np.nan
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+class ProvinceState:
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.sorted_values = []
+        self.minimums = deque()
+        self.total = 0.0
+        # Кліматологія за тижнем року: кількість, середнє, M2 (алгоритм Велфорда)
+        self.count = np.zeros(weeks_in_year + 1, dtype=np.int64)
+        self.mean = np.zeros(weeks_in_year + 1)
+        self.m2 = np.zeros(weeks_in_year + 1)
+        self.run = 0
+        self.longest_run = 0
+        self.last = (0, 0)
+
+    def push(self, value):
+        self.values.append(value)
+        self.total += value
+        bisect.insort(self.sorted_values, value)
+        # монотонна черга: мінімум вікна завжди на початку
+        while self.minimums and self.minimums[-1] > value:
+            self.minimums.pop()
+        self.minimums.append(value)
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            self.total -= old
+            del self.sorted_values[bisect.bisect_left(self.sorted_values, old)]
+            if self.minimums[0] == old:
+                self.minimums.popleft()
+
+    def z_score(self, week, value):
+        count = self.count[week]
+        if count < 2:
+            return np.nan
+        std = np.sqrt(self.m2[week] / (count - 1))
+        return (value - self.mean[week]) / std if std > 0 else np.nan
+
+    def add_to_climatology(self, week, value):
+        self.count[week] += 1
+        delta = value - self.mean[week]
+        self.mean[week] += delta / self.count[week]
+        self.m2[week] += delta * (value - self.mean[week])
+
+
+class RollingVHI:
+    def __init__(self, window=52, percentiles=(10, 50, 90), threshold=35):
+        self.window = window
+        self.percentiles = percentiles
+        self.threshold = threshold
+        self.states = {}
+
+    def state(self, area):
+        if area not in self.states:
+            self.states[area] = ProvinceState(self.window)
+        return self.states[area]
+
+    # Початковий стан з уже завантаженого фрейму (результат combine_csv_files)
+    def fit(self, dataframe):
+        df = dataframe.sort_values(['Area', 'Year', 'Week'])
+        for area, group in df.groupby('Area', observed=True, sort=False):
+            state = self.state(area)
+            vhi = group['VHI'].to_numpy(dtype=np.float64)
+            weeks = group['Week'].to_numpy(dtype=np.int64)
+
+            # кліматологія рахується векторно для всієї історії
+            climate = pd.Series(vhi).groupby(weeks).agg(['count', 'mean', 'var'])
+            state.count[climate.index] = climate['count'].to_numpy()
+            state.mean[climate.index] = climate['mean'].to_numpy()
+            state.m2[climate.index] = (climate['var'].fillna(0) * (climate['count'] - 1)).to_numpy()
+
+            for value in vhi[-self.window:]:
+                state.push(value)
+
+            dry = vhi < self.threshold
+            if len(dry):
+                run_ends = np.flatnonzero(np.diff(np.concatenate(([0], dry.astype(np.int8), [0]))))
+                lengths = run_ends[1::2] - run_ends[::2]
+                state.longest_run = int(lengths.max()) if len(lengths) else 0
+                state.run = int(lengths[-1]) if dry[-1] else 0
+                state.last = (int(group['Year'].iloc[-1]), int(weeks[-1]))
+        return self
+
+    # Оновлення однієї області новим тижнем: O(1) амортизовано (крім вставки в
+    # відсортоване вікно фіксованого розміру)
+    def update(self, area, year, week, vhi):
+        state = self.state(area)
+        if (year, week) <= state.last:
+            return None
+        state.last = (year, week)
+        z = state.z_score(week, vhi)
+        state.add_to_climatology(week, vhi)
+        state.push(vhi)
+        state.run = state.run + 1 if vhi < self.threshold else 0
+        state.longest_run = max(state.longest_run, state.run)
+        return self.snapshot(area, z)
+
+    # Нові рядки від завантажувача; вже відомі тижні пропускаються
+    def update_frame(self, dataframe):
+        rows = []
+        df = dataframe.sort_values(['Year', 'Week'])
+        for area, year, week, vhi in zip(df['Area'], df['Year'], df['Week'], df['VHI']):
+            result = self.update(area, int(year), int(week), float(vhi))
+            if result is not None:
+                rows.append({'Area': area, 'Year': int(year), 'Week': int(week), 'VHI': float(vhi), **result})
+        return pd.DataFrame(rows)
+
+    def snapshot(self, area, z=np.nan):
+        state = self.states[area]
+        result = {
+            'rolling_mean': state.total / len(state.values) if state.values else np.nan,
+            'rolling_min': state.minimums[0] if state.minimums else np.nan,
+        }
+        for q in self.percentiles:
+            result[f'p{q}'] = sorted_percentile(state.sorted_values, q)
+        result['z_score'] = z
+        result['drought_run'] = state.run
+        result['longest_drought_run'] = state.longest_run
+        return result
+
+    def summary(self):
+        return pd.DataFrame({area: self.snapshot(area) for area in sorted(self.states)}).T
+
+
+# Повний векторний перерахунок історії (для першого запуску і перевірки)
+def rolling_history(dataframe, window=52, percentiles=(10, 50, 90), threshold=35):
+    df = dataframe.sort_values(['Area', 'Year', 'Week']).reset_index(drop=True)
+    grouped = df.groupby('Area', observed=True)['VHI']
+    result = df[['Area', 'Year', 'Week', 'VHI']].copy()
+    result['rolling_mean'] = grouped.transform(lambda v: v.rolling(window, min_periods=1).mean())
+    result['rolling_min'] = grouped.transform(lambda v: v.rolling(window, min_periods=1).min())
+    for q in percentiles:
+        result[f'p{q}'] = grouped.transform(lambda v: v.rolling(window, min_periods=1).quantile(q / 100))
+
+    # z-оцінка відносно кліматології попередніх років для того ж тижня
+    by_week = df.groupby(['Area', 'Week'], observed=True)['VHI']
+    count = by_week.cumcount()
+    mean = by_week.transform(lambda v: v.expanding().mean().shift())
+    std = by_week.transform(lambda v: v.expanding().std().shift())
+    result['z_score'] = ((df['VHI'] - mean) / std).where(count >= 2)
+
+    dry = df['VHI'] < threshold
+    run_id = (~dry | (df['Area'] != df['Area'].shift())).cumsum()
+    result['drought_run'] = dry.groupby(run_id).cumsum().where(dry, 0).astype(np.int64)
+    return result
@@ -0,0 +1,100 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from lab2_ingest import column_names, load_vhi, store_path
+
+
+class VHIStore:
+    def __init__(self, dataframe):
+        order = np.lexsort((dataframe['Week'].to_numpy(), dataframe['Year'].to_numpy(),
+                            np.asarray(dataframe['Area'], dtype=np.int64)))
+        # Стовпці зберігаються окремими суцільними масивами, тож зріз є view
+        self.columns = {}
+        for name in column_names:
+            values = np.asarray(dataframe[name])
+            self.columns[name] = np.ascontiguousarray(values[order])
+
+        area = self.columns['Area'].astype(np.int64)
+        year = self.columns['Year'].astype(np.int64)
+        keys = area * 10000 + year
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1)) if len(keys) else np.array([], dtype=np.int64)
+        stops = np.append(starts[1:], len(keys))
+
+        self.group_area = area[starts]
+        self.group_year = year[starts]
+        self.group_starts = starts
+        self.index = {(a, y): (s, e) for a, y, s, e in
+                      zip(self.group_area.tolist(), self.group_year.tolist(), starts.tolist(), stops.tolist())}
+        self.area_index = {}
+        for (a, _), (s, e) in self.index.items():
+            first, _ = self.area_index.get(a, (s, e))
+            self.area_index[a] = (first, e)
+        self._group_stats = None
+
+    @classmethod
+    def load(cls, file_path="EveryData.csv"):
+        if os.path.exists(store_path(file_path)):
+            return cls(load_vhi(file_path))
+        return cls(pd.read_csv(file_path))
+
+    @property
+    def areas(self):
+        return sorted(self.area_index)
+
+    @property
+    def years(self):
+        return np.unique(self.group_year)
+
+    # O(1) пошук зрізу області за рік, без копіювання
+    def series(self, area, year, column='VHI'):
+        start, stop = self.index.get((area, year), (0, 0))
+        return self.columns[column][start:stop]
+
+    # Зріз області за діапазон років (рядки області відсортовані за роком)
+    def year_range(self, area, start_year, end_year, column='VHI'):
+        first, last = self.area_index.get(area, (0, 0))
+        years = self.columns['Year'][first:last]
+        start = first + np.searchsorted(years, start_year, side='left')
+        stop = first + np.searchsorted(years, end_year, side='right')
+        return self.columns[column][start:stop]
+
+    # Мінімум, максимум і середнє для кожної пари (область, рік) за один прохід
+    @property
+    def group_stats(self):
+        if self._group_stats is None:
+            vhi = self.columns['VHI']
+            starts = self.group_starts
+            counts = np.diff(np.append(starts, len(vhi)))
+            index = pd.MultiIndex.from_arrays([self.group_area, self.group_year], names=['Area', 'Year'])
+            self._group_stats = pd.DataFrame({
+                'min': np.minimum.reduceat(vhi, starts) if len(vhi) else vhi,
+                'max': np.maximum.reduceat(vhi, starts) if len(vhi) else vhi,
+                'mean': (np.add.reduceat(vhi.astype(np.float64), starts) / counts) if len(vhi) else vhi,
+                'weeks': counts,
+            }, index=index)
+        return self._group_stats
+
+    # Екстремуми для всіх областей у вказаному році
+    def extremes(self, year):
+        stats = self.group_stats
+        return stats.xs(year, level='Year')[['min', 'max']]
+
+    def extremes_for_areas(self, areas, year):
+        return self.extremes(year).reindex(areas)
+
+
+def calculate_vhi_extremes_for_province(store, year, province_id):
+    vhi = store.series(province_id, year)
+    print(f'For {year} and province {province_id}:')
+    print(f'Min VHI: {vhi.min() if len(vhi) else np.nan}')
+    print(f'Max VHI: {vhi.max() if len(vhi) else np.nan}')
+    print(f'VHI values for province {province_id} in {year}: {vhi.tolist()}')
+
+
+def vhi_range_for_areas(store, selected_areas, year_range=(1982, 2024)):
+    start_year, end_year = year_range
+    for area in selected_areas:
+        values = store.year_range(area, start_year, end_year)
+        print(f'Для області {area} в період з {start_year} по {end_year} ряд VHI: {values}')
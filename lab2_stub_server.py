@@ -0,0 +1,103 @@
+import threading
+import random
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+# Локальна заміна get_TS_admin.php для перевірки завантажувача без мережі
+
+
+def generate_rows(province_id, year1, year2, weeks=52, seed=0):
+    rows = []
+    for year in range(year1, year2 + 1):
+        rng = random.Random(seed * 100003 + province_id * 1009 + year)
+        for week in range(1, weeks + 1):
+            smn = rng.uniform(0.02, 0.5)
+            smt = rng.uniform(250, 300)
+            vci = rng.uniform(0, 100)
+            tci = rng.uniform(0, 100)
+            vhi = -1 if (year == 1981 and week < 35) else (vci + tci) / 2
+            rows.append(f'{year},{week:3d},{smn:7.3f},{smt:6.2f},{vci:6.2f},{tci:6.2f},{vhi:6.2f},')
+    return rows
+
+
+def render(province_id, year1, year2, data):
+    lines = [f'<tt><pre>Ukraine, Province:  {province_id}: Stub {year1}-{year2}',
+             'year,week, SMN,SMT,VCI,TCI,VHI']
+    for year in range(year1, year2 + 1):
+        lines.extend(data.get((province_id, year), []))
+    lines.append('</pre></tt>')
+    return '\n'.join(lines) + '\n'
+
+
+class StubNOAA:
+    def __init__(self, provinces=range(1, 28), year1=1981, year2=2024, seed=0, fail_first=0):
+        self.data = {(p, y): generate_rows(p, y, y, seed=seed)
+                     for p in provinces for y in range(year1, year2 + 1)}
+        self.requests = []
+        self.connections = set()
+        self.fail_first = fail_first
+        self.lock = threading.Lock()
+        self.server = None
+
+    # Імітація оновлення даних NOAA за певний рік
+    def update_year(self, province_id, year, seed=1):
+        self.data[(province_id, year)] = generate_rows(province_id, year, year, seed=seed)
+
+    def handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                query = parse_qs(url.query)
+                with stub.lock:
+                    stub.requests.append(self.path)
+                    stub.connections.add(self.client_address)
+                    fail = stub.fail_first > 0
+                    if fail:
+                        stub.fail_first -= 1
+                if fail:
+                    self.reply(503, b'busy')
+                    return
+                if not url.path.endswith('get_TS_admin.php') or 'provinceID' not in query:
+                    self.reply(404, b'not found')
+                    return
+                province_id = int(query['provinceID'][0])
+                year1 = int(query.get('year1', ['1981'])[0])
+                year2 = int(query.get('year2', ['2024'])[0])
+                self.reply(200, render(province_id, year1, year2, stub.data).encode('utf-8'))
+
+            def reply(self, status, body):
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self, host='127.0.0.1', port=0):
+        self.server = ThreadingHTTPServer((host, port), self.handler())
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}/smcd/emb/vci/VH/get_TS_admin.php'
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,198 @@
+import os
+import gc
+import sys
+import csv
+import json
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import lab4_query
+import lab4_tasks
+import lab4_sampling
+from lab4_power import csv_path, generate_power_csv, load_power, to_frame, object_array_path, task1_np
+from timing import timed
+
+default_sizes = (10_000, 100_000, 1_000_000, None)
+sample_share = 0.25
+
+
+# Варіант завдання: функція, вхід, на якому вона працює, і чи змінює вона вхід
+# (такі варіанти отримують свіжу копію перед кожним запуском)
+class Case:
+    def __init__(self, task, variant, source, func, mutates=False):
+        self.task, self.variant, self.source = task, variant, source
+        self.func, self.mutates = func, mutates
+
+    def prepare(self, data):
+        if not self.mutates:
+            return data
+        return data.copy() if isinstance(data, pd.DataFrame) else np.array(data)
+
+
+def sample_size(data):
+    return min(500_000, int(len(data) * sample_share))
+
+
+def cases():
+    legacy = lab4_query.legacy_tasks
+    result = [
+        Case('task1', 'objects', 'objects', task1_np, mutates=True),
+        Case('task1', 'pandas', 'pandas', legacy['task1'][1]),
+        Case('task1', 'typed', 'table', lab4_query.task1.select),
+        Case('task1', 'typed_df', 'frame', lab4_query.task1.select),
+    ]
+    for name in ['task2', 'task3']:
+        query = getattr(lab4_query, name)
+        result += [
+            Case(name, 'objects', 'objects', legacy[name][0]),
+            Case(name, 'pandas', 'pandas', legacy[name][1]),
+            Case(name, 'typed', 'table', query.select),
+            Case(name, 'typed_df', 'frame', query.select),
+        ]
+    result += [
+        Case('task4', 'objects', 'objects', lambda d: lab4_sampling.task4_np_choice(d, sample_size(d))),
+        Case('task4', 'pandas', 'pandas', lambda d: lab4_sampling.task4_df_sample(d, sample_size(d))),
+        Case('task4', 'typed', 'table', lambda d: lab4_sampling.task4_np(d, sample_size(d))),
+        Case('task4', 'typed_df', 'frame', lambda d: lab4_sampling.task4_df(d, sample_size(d))),
+        Case('task5', 'objects', 'objects', lab4_tasks.task5_np_strings),
+        # task5_df_strings додає стовпець DateTime до свого входу
+        Case('task5', 'pandas', 'pandas', lab4_tasks.task5_df_strings, mutates=True),
+        Case('task5', 'typed', 'table', lab4_tasks.task5_np),
+        Case('task5', 'typed_df', 'frame', lab4_tasks.task5_df),
+    ]
+    return result
+
+
+# Усі представлення даних з одного CSV: масив об'єктів і DataFrame з ноутбука,
+# типізована таблиця (lab4_power) і DataFrame з неї
+def load_sources(path):
+    table = load_power(path, mmap=False)
+    table = table[~np.isnan(table['Global_active_power'])]
+    return {
+        'objects': object_array_path(path),
+        'pandas': pd.read_csv(path, na_values='?').dropna().reset_index(drop=True),
+        'table': table,
+        'frame': to_frame(table),
+    }
+
+
+def head(data, n):
+    if n is None or n >= len(data):
+        return data
+    return data.iloc[:n].copy() if isinstance(data, pd.DataFrame) else np.array(data[:n])
+
+
+def result_rows(result):
+    return len(result) if hasattr(result, '__len__') else 1
+
+
+# Час: warm-up, потім repeats запусків без tracemalloc (він сповільнює алокації).
+# Пам'ять: окремий запуск під tracemalloc - пік і кількість блоків, що лишилися
+# виділеними після виклику (разом з результатом); загальну кількість алокацій
+# tracemalloc не рахує
+def run_case(case, data, warmup=1, repeats=5):
+    for _ in range(warmup):
+        case.func(case.prepare(data))
+
+    times = []
+    for _ in range(repeats):
+        args = case.prepare(data)
+        gc.collect()
+        _, elapsed = timed(case.func, args)
+        times.append(elapsed)
+        del args
+
+    args = case.prepare(data)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    result = case.func(args)
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained_blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename'))
+
+    return {
+        'task': case.task, 'variant': case.variant, 'rows': len(data), 'repeats': repeats,
+        'min_s': min(times), 'median_s': statistics.median(times), 'mean_s': statistics.fmean(times),
+        'peak_bytes': peak, 'retained_blocks': retained_blocks, 'result_rows': result_rows(result),
+    }
+
+
+def run_suite(path, sizes=default_sizes, warmup=1, repeats=5, tasks=None):
+    sources = load_sources(path)
+    results = []
+    for size in sizes:
+        inputs = {name: head(data, size) for name, data in sources.items()}
+        for case in cases():
+            if tasks and case.task not in tasks:
+                continue
+            results.append(run_case(case, inputs[case.source], warmup, repeats))
+        del inputs
+    return results
+
+
+def environment():
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+            'machine': platform.machine(), 'time': time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+
+# JSON (з описом середовища) або CSV - за розширенням файлу
+def write_results(results, path):
+    if path.endswith('.csv'):
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0]))
+            writer.writeheader()
+            writer.writerows(results)
+    else:
+        with open(path, 'w') as f:
+            json.dump({'environment': environment(), 'results': results}, f, indent=1)
+
+
+def print_results(results):
+    for r in results:
+        print(f"{r['task']:6} {r['variant']:9} {r['rows']:>9} рядків: медіана {r['median_s'] * 1000:9.2f} мс, "
+              f"мін {r['min_s'] * 1000:9.2f} мс, пік {r['peak_bytes'] / 2**20:8.1f} МБ, залишилося блоків {r['retained_blocks']}")
+
+
+def parse_sizes(text):
+    return tuple(None if part == 'full' else int(float(part)) for part in text.split(','))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Бенчмарк завдань Lab4')
+    parser.add_argument('--path', default=None, help='CSV з даними (за замовчуванням - набір UCI або синтетичний)')
+    parser.add_argument('--rows', type=int, default=2_000_000, help='розмір синтетичного набору')
+    parser.add_argument('--sizes', type=parse_sizes, default=default_sizes, help='напр. 1e4,1e5,1e6,full')
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--tasks', default=None, help='напр. task1,task5')
+    parser.add_argument('--out', default=None, help='файл результатів .json або .csv')
+    args = parser.parse_args(argv)
+
+    tasks = args.tasks.split(',') if args.tasks else None
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.path
+        if path is None and os.path.exists(csv_path):
+            path = csv_path
+        if path is None:
+            path = os.path.join(tmp, 'power.csv')
+            generate_power_csv(path, args.rows)
+        results = run_suite(path, args.sizes, args.warmup, args.repeats, tasks)
+
+    print_results(results)
+    if args.out:
+        write_results(results, args.out)
+    return results
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,137 @@
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from lab4_power import power_dtype, read_csv_chunks, chunk_to_table
+
+sub_metering = ['Sub_metering_1', 'Sub_metering_2', 'Sub_metering_3']
+default_chunk_rows = 1 << 18
+
+
+# Джерело частин: memory-mapped кеш .npy (частини читаються незалежно, тож їх
+# можна обробляти паралельно) або CSV, що читається потоком
+def chunk_ranges(n_rows, chunk_rows=default_chunk_rows):
+    return [(start, min(n_rows, start + chunk_rows)) for start in range(0, n_rows, chunk_rows)]
+
+
+def load_chunk(path, start, stop):
+    return np.load(path, mmap_mode='r')[start:stop]
+
+
+def run_chunk(func, path, start, stop, args):
+    return func(load_chunk(path, start, stop), start, *args)
+
+
+# Застосування func(chunk, start, *args) до кожної частини; результати видаються
+# по одному в порядку частин. CSV читається потоком в одному процесі, тож
+# processes діє лише для кешу .npy
+def iter_chunks(func, path, args=(), chunk_rows=default_chunk_rows, processes=None):
+    if path.endswith('.csv'):
+        start = 0
+        for chunk in read_csv_chunks(path, chunk_rows):
+            table = chunk_to_table(chunk)
+            yield func(table, start, *args)
+            start += len(table)
+        return
+
+    n_rows = len(np.load(path, mmap_mode='r'))
+    ranges = chunk_ranges(n_rows, chunk_rows)
+    if not processes:
+        for start, stop in ranges:
+            yield run_chunk(func, path, start, stop, args)
+        return
+    starts = [start for start, _ in ranges]
+    stops = [stop for _, stop in ranges]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        yield from pool.map(run_chunk, repeat(func), repeat(path), starts, stops, repeat(args))
+
+
+def map_chunks(func, path, args=(), chunk_rows=default_chunk_rows, processes=None):
+    return list(iter_chunks(func, path, args, chunk_rows, processes))
+
+
+def filter_chunk(chunk, start, query):
+    return np.array(chunk[query.indices(chunk)])
+
+
+def count_chunk(chunk, start, query):
+    return query.count(chunk)
+
+
+def sums_chunk(chunk, start, columns):
+    sums = np.empty(len(columns))
+    counts = np.empty(len(columns), dtype=np.int64)
+    for i, name in enumerate(columns):
+        values = chunk[name]
+        valid = ~np.isnan(values)
+        sums[i] = values[valid].sum(dtype=np.float64)
+        counts[i] = np.count_nonzero(valid)
+    return sums, counts
+
+
+# Рядки, що задовольняють запиту (lab4_query), зібрані з усіх частин у початковому порядку
+def filter_rows(path, query, chunk_rows=default_chunk_rows, processes=None):
+    parts = map_chunks(filter_chunk, path, (query,), chunk_rows, processes)
+    return np.concatenate(parts) if parts else np.empty(0, dtype=power_dtype)
+
+
+def count_where(path, query, chunk_rows=default_chunk_rows, processes=None):
+    return sum(map_chunks(count_chunk, path, (query,), chunk_rows, processes))
+
+
+# Середні значення: з частин збираються суми і кількості, тож злиття точне
+# (а не середнє середніх)
+def column_means(path, columns=sub_metering, chunk_rows=default_chunk_rows, processes=None):
+    parts = map_chunks(sums_chunk, path, (columns,), chunk_rows, processes)
+    sums = np.sum([part[0] for part in parts], axis=0)
+    counts = np.sum([part[1] for part in parts], axis=0)
+    return dict(zip(columns, sums / counts))
+
+
+# Ключ рядка: хеш splitmix64 від (seed, номер рядка), тож вибірка не залежить
+# від розміру частин і кількості процесів
+def row_keys(seed, start, stop):
+    with np.errstate(over='ignore'):
+        z = np.arange(start, stop, dtype=np.uint64) + np.uint64(seed) * np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+def bottom_k(keys, positions, k):
+    if len(keys) > k:
+        best = np.argpartition(keys, k - 1)[:k]
+        keys, positions = keys[best], positions[best]
+    return keys, positions
+
+
+def sample_chunk(chunk, start, k, seed, dropna):
+    keys = row_keys(seed, start, start + len(chunk))
+    if dropna:
+        valid = ~np.isnan(chunk['Global_active_power'])
+        keys, rows = keys[valid], np.flatnonzero(valid)
+    else:
+        rows = np.arange(len(chunk))
+    return bottom_k(keys, rows + start, k)
+
+
+def take_chunk(chunk, start, positions):
+    lo, hi = np.searchsorted(positions, [start, start + len(chunk)])
+    return np.array(chunk[positions[lo:hi] - start])
+
+
+# Вибірка k рядків без повторень (bottom-k): частини дають лише ключі й номери
+# своїх k найкращих рядків, а злиття на ходу тримає k найменших ключів. Самі
+# рядки читаються другим проходом - з memmap кешу .npy або потоком з CSV
+def sample_rows(path, k, seed=0, dropna=True, chunk_rows=default_chunk_rows, processes=None):
+    keys = np.empty(0, dtype=np.uint64)
+    positions = np.empty(0, dtype=np.int64)
+    for part_keys, part_positions in iter_chunks(sample_chunk, path, (k, seed, dropna), chunk_rows, processes):
+        keys, positions = bottom_k(np.concatenate((keys, part_keys)),
+                                   np.concatenate((positions, part_positions)), k)
+    positions = np.sort(positions)
+    if not path.endswith('.csv'):
+        return np.asarray(np.load(path, mmap_mode='r')[positions])
+    parts = map_chunks(take_chunk, path, (positions,), chunk_rows)
+    return np.concatenate(parts) if parts else np.empty(0, dtype=power_dtype)
@@ -0,0 +1,147 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.stats import pearsonr, spearmanr, rankdata
+
+from lab4_scaling import select, heart_features, generate_heart
+from lab4_chunked import map_chunks, default_chunk_rows
+from timing import timed
+
+
+# Достатні статистики для матриці Пірсона: кількість рядків, вектор середніх і
+# матриця центрованих сум добутків. Блок додається одним X^T X, а два накопичувачі
+# зливаються (формула Чана), тож частини можна рахувати в різних процесах.
+# Центровані суми замість сирих Σx, Σxy не втрачають точність на великих значеннях
+class CorrelationStats:
+    def __init__(self, n_columns):
+        self.n = 0
+        self.mean = np.zeros(n_columns)
+        self.comoment = np.zeros((n_columns, n_columns))
+
+    # Рядки з пропусками відкидаються (як dropna перед np.corrcoef у Lab4.ipynb)
+    def update(self, block):
+        block = np.asarray(block, dtype=np.float64)
+        block = block[~np.isnan(block).any(axis=1)]
+        if len(block) == 0:
+            return self
+        mean = block.mean(axis=0)
+        centered = block - mean
+        return self.combine(len(block), mean, centered.T @ centered)
+
+    def combine(self, n, mean, comoment):
+        total = self.n + n
+        delta = mean - self.mean
+        self.comoment = self.comoment + comoment + np.outer(delta, delta) * (self.n * n / total)
+        self.mean = self.mean + delta * (n / total)
+        self.n = total
+        return self
+
+    def merge(self, other):
+        if other.n:
+            self.combine(other.n, other.mean, other.comoment)
+        return self
+
+    def covariance(self, ddof=1):
+        return self.comoment / (self.n - ddof)
+
+    def pearson(self):
+        std = np.sqrt(np.diag(self.comoment))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = self.comoment / np.outer(std, std)
+        np.clip(corr, -1.0, 1.0, out=corr)
+        return corr
+
+
+def block_stats(block):
+    return CorrelationStats(block.shape[1]).update(block)
+
+
+def merge_stats(parts):
+    total = parts[0]
+    for part in parts[1:]:
+        total.merge(part)
+    return total
+
+
+# Матриця Пірсона по частинах: data - масив/DataFrame або ітератор частин;
+# processes розподіляє частини масиву між процесами
+def pearson_matrix(data, columns=None, chunk_rows=default_chunk_rows, processes=None):
+    if isinstance(data, (pd.DataFrame, np.ndarray)):
+        values = matrix(data, columns)
+        blocks = [values[i:i + chunk_rows] for i in range(0, len(values), chunk_rows)]
+    else:
+        blocks = (matrix(block, columns) for block in data)
+    if processes:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            parts = list(pool.map(block_stats, blocks))
+    else:
+        parts = [block_stats(block) for block in blocks]
+    return merge_stats(parts).pearson()
+
+
+def matrix(data, columns=None):
+    if columns is None:
+        return data.to_numpy(dtype=np.float64) if isinstance(data, pd.DataFrame) else np.asarray(data, dtype=np.float64)
+    return select(data, columns)
+
+
+# Спірмен: кожен стовпець ранжується один раз (середні ранги для однакових
+# значень), далі Пірсон по матриці рангів
+def rank_columns(values):
+    values = values[~np.isnan(values).any(axis=1)]
+    return rankdata(values, axis=0)
+
+
+def spearman_matrix(data, columns=None, chunk_rows=default_chunk_rows):
+    return pearson_matrix(rank_columns(matrix(data, columns)), chunk_rows=chunk_rows)
+
+
+def as_frame(corr, columns):
+    return pd.DataFrame(corr, index=columns, columns=columns)
+
+
+# Кореляції для типізованого кешу електроспоживання (lab4_power): частини .npy
+# читаються незалежно і можуть рахуватися в пулі процесів
+def power_chunk_stats(chunk, start, columns):
+    return block_stats(np.column_stack([chunk[name] for name in columns]))
+
+
+def power_pearson(path, columns, chunk_rows=default_chunk_rows, processes=None):
+    parts = map_chunks(power_chunk_stats, path, (columns,), chunk_rows, processes)
+    return as_frame(merge_stats(parts).pearson(), columns)
+
+
+# Поточний шлях з Lab4.ipynb: кожна пара окремим викликом pearsonr/spearmanr
+def pairwise_loop(data_np):
+    n = data_np.shape[1]
+    pearson, spearman = np.eye(n), np.eye(n)
+    for i in range(n):
+        for j in range(i + 1, n):
+            pearson[i, j] = pearson[j, i] = pearsonr(data_np[:, i], data_np[:, j])[0]
+            spearman[i, j] = spearman[j, i] = spearmanr(data_np[:, i], data_np[:, j])[0]
+    return pearson, spearman
+
+
+def benchmark(n_rows=1_000_000):
+    df = generate_heart(n_rows).dropna().reset_index(drop=True)
+    data_np = df.to_numpy()
+
+    old_df, old_df_time = timed(df.corr)
+    old_np, old_np_time = timed(np.corrcoef, data_np.T)
+    old_pairs, pairs_time = timed(pairwise_loop, data_np[:100_000])
+    new_p, new_p_time = timed(pearson_matrix, data_np)
+    _, df_time = timed(pearson_matrix, df)
+    new_s, new_s_time = timed(spearman_matrix, data_np[:100_000])
+
+    assert np.allclose(old_np, new_p) and np.allclose(old_df.to_numpy(), new_p)
+    assert np.allclose(old_pairs[1], new_s)
+    print(f'Пірсон: df.corr {old_df_time * 1000:.1f} мс, np.corrcoef {old_np_time * 1000:.1f} мс -> '
+          f'по частинах {new_p_time * 1000:.1f} мс (DataFrame {df_time * 1000:.1f} мс)')
+    print(f'Попарні pearsonr/spearmanr (100000 рядків): {pairs_time * 1000:.1f} мс -> '
+          f'Спірмен матрицею {new_s_time * 1000:.1f} мс')
+    print(as_frame(new_p, heart_features).round(2))
+
+
+if __name__ == '__main__':
+    benchmark()
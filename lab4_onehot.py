@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from lab4_scaling import generate_heart
+from timing import timed
+
+try:
+    from sklearn.preprocessing import OneHotEncoder as SklearnOneHotEncoder
+except ImportError:
+    SklearnOneHotEncoder = None
+
+
+def column_values(data, name):
+    if isinstance(data, pd.DataFrame):
+        return data[name].to_numpy()
+    return np.asarray(data)[:, name]
+
+
+def category_name(column, value):
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        value = int(value)
+    return f'{column}_{value}'
+
+
+# One-hot кодування без sklearn. Категорії кожного стовпця збираються за один
+# прохід по частинах (відсортований масив, злиття через union1d); transform дає
+# CSR-матрицю (лише позиції одиниць) або щільний блок uint8. Результат - окремий
+# блок: базова таблиця не копіюється і не розширюється
+class OneHotEncoder:
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.categories = [None] * len(self.columns)
+
+    def partial_fit(self, data):
+        for i, name in enumerate(self.columns):
+            values = column_values(data, name)
+            found = np.unique(values[~pd.isna(values)])
+            known = self.categories[i]
+            self.categories[i] = found if known is None else np.union1d(known, found)
+        return self
+
+    # Навчання з нуля: категорії попередніх викликів fit відкидаються
+    def fit(self, data):
+        self.categories = [None] * len(self.columns)
+        if isinstance(data, (pd.DataFrame, np.ndarray)):
+            data = [data]
+        for block in data:
+            self.partial_fit(block)
+        return self
+
+    def offsets(self):
+        return np.cumsum([0] + [len(c) for c in self.categories])
+
+    def feature_names(self):
+        return [category_name(name, value) for name, categories in zip(self.columns, self.categories)
+                for value in categories]
+
+    # Номер ознаки для кожного значення; -1 - пропуск або невідома категорія
+    # (такий рядок отримує нулі в цьому стовпці, як handle_unknown='ignore')
+    def codes(self, data):
+        offsets = self.offsets()
+        codes = np.empty((len(data), len(self.columns)), dtype=np.int64)
+        for i, name in enumerate(self.columns):
+            values = column_values(data, name)
+            categories = self.categories[i]
+            if len(categories) == 0:
+                codes[:, i] = -1
+                continue
+            valid = ~pd.isna(values)
+            position = np.zeros(len(values), dtype=np.int64)
+            position[valid] = np.searchsorted(categories, values[valid])
+            np.minimum(position, len(categories) - 1, out=position)
+            valid &= categories[position] == values
+            codes[:, i] = np.where(valid, position + offsets[i], -1)
+        return codes
+
+    def transform(self, data, sparse=True):
+        codes = self.codes(data)
+        n_features = self.offsets()[-1]
+        if not sparse:
+            out = np.zeros((len(codes), n_features), dtype=np.uint8)
+            rows, cols = np.nonzero(codes >= 0)
+            out[rows, codes[rows, cols]] = 1
+            return out
+        valid = codes >= 0
+        indptr = np.concatenate(([0], np.cumsum(valid.sum(axis=1))))
+        indices = codes[valid]
+        ones = np.ones(len(indices), dtype=np.uint8)
+        return sp.csr_matrix((ones, indices, indptr), shape=(len(codes), n_features))
+
+    def fit_transform(self, data, sparse=True):
+        return self.fit(data).transform(data, sparse)
+
+    # Кодування потоку частин: блоки виходять по одному (категорії вже навчені)
+    def transform_chunks(self, chunks, sparse=True):
+        for chunk in chunks:
+            yield self.transform(chunk, sparse)
+
+    # Блок як DataFrame з розрідженими стовпцями, з тим самим індексом, що й база
+    def to_frame(self, encoded, index=None):
+        if sp.issparse(encoded):
+            return pd.DataFrame.sparse.from_spmatrix(encoded, index=index, columns=self.feature_names())
+        return pd.DataFrame(encoded, index=index, columns=self.feature_names())
+
+
+# Поточний шлях з Lab4.ipynb: sklearn, .toarray() і копія всієї таблиці
+def concat_dense(data_np, column=1):
+    encoder = SklearnOneHotEncoder()
+    encoded_data = encoder.fit_transform(data_np[:, column].reshape(-1, 1)).toarray()
+    return np.concatenate((data_np, encoded_data), axis=1)
+
+
+def benchmark(n_rows=2_000_000, chunk_rows=1 << 18):
+    df = generate_heart(n_rows).dropna().reset_index(drop=True)
+    data_np = df.to_numpy()
+    # стовпець з високою кардинальністю для порівняння
+    df['patient'] = np.random.default_rng(0).integers(0, 50_000, len(df))
+
+    if SklearnOneHotEncoder is not None:
+        old, old_time = timed(concat_dense, data_np)
+        print(f'sklearn + toarray + concatenate: {old_time * 1000:.1f} мс, {old.nbytes / 2**20:.0f} МБ')
+
+    encoder = OneHotEncoder(['sex', 'cp', 'patient'])
+    chunks = [df[i:i + chunk_rows] for i in range(0, len(df), chunk_rows)]
+    _, fit_time = timed(encoder.fit, chunks)
+    encoded, csr_time = timed(encoder.transform, df)
+    dense, dense_time = timed(OneHotEncoder([1, 2]).fit_transform, data_np, False)
+    size = encoded.data.nbytes + encoded.indices.nbytes + encoded.indptr.nbytes
+    print(f'fit частинами {fit_time * 1000:.1f} мс, ознак {len(encoder.feature_names())}')
+    print(f'CSR: {csr_time * 1000:.1f} мс, {size / 2**20:.0f} МБ '
+          f'(щільний uint8 був би {len(df) * encoded.shape[1] / 2**20:.0f} МБ)')
+    print(f'uint8 для стовпців 1, 2 масиву (sex, cp): {dense_time * 1000:.1f} мс, {dense.nbytes / 2**20:.0f} МБ')
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,195 @@
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from timing import measure
+
+csv_path = 'individual_household_electric_power_consumption.csv'
+measure_columns = ['Global_active_power', 'Global_reactive_power', 'Voltage', 'Global_intensity',
+                   'Sub_metering_1', 'Sub_metering_2', 'Sub_metering_3']
+# Hour та Minute (хвилина доби) обчислюються один раз при побудові кешу, тож
+# часові фільтри стають цілочисельними порівняннями
+power_dtype = np.dtype([('Timestamp', 'datetime64[m]'), ('Hour', np.int8), ('Minute', np.int16)]
+                       + [(name, np.float32) for name in measure_columns])
+
+
+def cache_path(path):
+    return os.path.splitext(path)[0] + '.npy'
+
+
+def count_rows(path):
+    with open(path, 'rb') as f:
+        lines = sum(block.count(b'\n') for block in iter(lambda: f.read(1 << 20), b''))
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+    return lines - 1 + (last != b'\n')
+
+
+# Дата/час розбираються лише для унікальних значень (днів ~1.5 тис., хвилин 1440)
+def parse_timestamps(dates, times):
+    date_codes, date_values = pd.factorize(dates)
+    time_codes, time_values = pd.factorize(times)
+    days = pd.to_datetime(pd.Index(date_values), format='%d/%m/%Y').to_numpy().astype('datetime64[m]')
+    minutes = (pd.to_timedelta(pd.Index(time_values)).to_numpy() // np.timedelta64(1, 'm')).astype(np.int64)
+    return days[date_codes] + minutes[time_codes].astype('timedelta64[m]')
+
+
+def read_csv_chunks(path=csv_path, chunksize=500_000):
+    types = dict.fromkeys(measure_columns, np.float32)
+    return pd.read_csv(path, na_values='?', dtype={'Date': str, 'Time': str, **types},
+                       chunksize=chunksize, keep_default_na=False)
+
+
+# Частина CSV у вигляді типізованого структурованого масиву
+def chunk_to_table(chunk, out=None):
+    if out is None:
+        out = np.empty(len(chunk), dtype=power_dtype)
+    stamps = parse_timestamps(chunk['Date'].to_numpy(), chunk['Time'].to_numpy())
+    minute = (stamps - stamps.astype('datetime64[D]')).astype(np.int64)
+    out['Timestamp'] = stamps
+    out['Minute'] = minute
+    out['Hour'] = minute // 60
+    for name in measure_columns:
+        out[name] = chunk[name].to_numpy()
+    return out
+
+
+# Перші n_rows рядків кешу в новий файл меншого розміру (через тимчасовий файл
+# поруч, який потім замінює кеш)
+def truncate_cache(cache, n_rows):
+    source = np.load(cache, mmap_mode='r')
+    part = cache + '.part'
+    table = np.lib.format.open_memmap(part, mode='w+', dtype=power_dtype, shape=(n_rows,))
+    table[:] = source[:n_rows]
+    table.flush()
+    del source, table
+    os.replace(part, cache)
+    return np.load(cache, mmap_mode='r+')
+
+
+# Розбір CSV частинами прямо в типізований memory-mapped файл: '?' стає NaN.
+# count_rows рахує і порожні рядки, які read_csv пропускає, тож незаповнений
+# хвіст (нульові рядки з часом 1970-01-01) відрізається
+def build_cache(path=csv_path, chunksize=500_000):
+    cache = cache_path(path)
+    n_rows = count_rows(path)
+    table = np.lib.format.open_memmap(cache, mode='w+', dtype=power_dtype, shape=(n_rows,))
+    position = 0
+    for chunk in read_csv_chunks(path, chunksize):
+        stop = position + len(chunk)
+        chunk_to_table(chunk, table[position:stop])
+        position = stop
+    table.flush()
+    if position < n_rows:
+        del table
+        table = truncate_cache(cache, position)
+    return table
+
+
+# Завантаження: якщо кеш свіжіший за CSV, він відкривається за мілісекунди
+def load_power(path=csv_path, mmap=True, rebuild=False):
+    cache = cache_path(path)
+    mmap_mode = 'r' if mmap else None
+    if not rebuild and os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(path):
+        table = np.load(cache, mmap_mode=mmap_mode)
+        # кеш старого формату перебудовується
+        if table.dtype == power_dtype:
+            return table
+        del table
+    build_cache(path)
+    return np.load(cache, mmap_mode=mmap_mode)
+
+
+def missing_mask(table):
+    return np.isnan(table['Global_active_power'])
+
+
+def drop_missing(table):
+    return table[~missing_mask(table)]
+
+
+def to_frame(table):
+    df = pd.DataFrame({name: table[name] for name in ['Hour', 'Minute'] + measure_columns})
+    df.insert(0, 'Timestamp', table['Timestamp'].astype('datetime64[s]'))
+    return df
+
+
+# Індекс за хвилиною доби: рядки, відсортовані за часом доби, тож вікно часу -
+# це два бінарні пошуки і зріз
+class TimeIndex:
+    def __init__(self, table):
+        minute = np.asarray(table['Minute'])
+        self.order = np.argsort(minute, kind='stable')
+        self.minutes = minute[self.order]
+
+    # Позиції рядків з часом доби в [start, end) у початковому порядку
+    def between(self, start, end=24 * 60):
+        lo = np.searchsorted(self.minutes, start, side='left')
+        hi = np.searchsorted(self.minutes, end, side='left')
+        return np.sort(self.order[lo:hi])
+
+    def after(self, hour, minute=0):
+        return self.between(hour * 60 + minute)
+
+
+# Синтетичний файл у форматі UCI для перевірок і бенчмарків
+def generate_power_csv(path, n_rows, seed=0, missing=0.01):
+    rng = np.random.default_rng(seed)
+    stamps = np.datetime64('2006-12-16T17:24') + np.arange(n_rows).astype('timedelta64[m]')
+    index = pd.DatetimeIndex(stamps)
+    df = pd.DataFrame({
+        'Date': index.strftime('%-d/%-m/%Y'),
+        'Time': index.strftime('%H:%M:%S'),
+        'Global_active_power': rng.gamma(1.5, 0.8, n_rows).round(3),
+        'Global_reactive_power': rng.gamma(1.2, 0.1, n_rows).round(3),
+        'Voltage': rng.normal(240, 3, n_rows).round(2),
+        'Global_intensity': rng.gamma(1.5, 3.0, n_rows).round(1),
+        'Sub_metering_1': rng.poisson(1.0, n_rows).astype(float),
+        'Sub_metering_2': rng.poisson(1.5, n_rows).astype(float),
+        'Sub_metering_3': rng.poisson(6.0, n_rows).astype(float),
+    })
+    df = df.astype(object)
+    df.loc[rng.random(n_rows) < missing, measure_columns] = '?'
+    df.to_csv(path, index=False)
+
+
+# Поточний шлях з Lab4.ipynb: масив об'єктів і .astype(float) при кожному запиті
+def object_array_path(path):
+    data_np = np.array(pd.read_csv(path, dtype=str, keep_default_na=False))
+    mask = np.any(data_np == '?', axis=1)
+    data_np = data_np[~mask]
+    # у наборі з ucimlrepo Sub_metering_3 вже числовий, решта - рядки
+    data_np[:, 2:9] = data_np[:, 2:9].astype(float)
+    return data_np
+
+
+def task1_np(data):
+    data[:, 2] = data[:, 2].astype(float)
+    return data[data[:, 2] > 5]
+
+
+def benchmark(path=None, n_rows=2_000_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        if path is None:
+            path = os.path.join(tmp, 'power.csv')
+            generate_power_csv(path, n_rows)
+        data_np, old_load, old_peak = measure(object_array_path, path)
+        _, old_query, _ = measure(task1_np, data_np)
+        del data_np
+
+        _, build_time, build_peak = measure(load_power, path, True, True)
+        table, load_time, load_peak = measure(load_power, path)
+        valid, drop_time, _ = measure(drop_missing, table)
+        _, new_query, _ = measure(lambda: valid[valid['Global_active_power'] > 5])
+        del table, valid
+
+    print(f'Масив об\'єктів: завантаження {old_load:.2f} с, пік {old_peak / 2**20:.0f} МБ, task1 {old_query * 1000:.1f} мс')
+    print(f'Побудова кешу:   {build_time:.2f} с, пік {build_peak / 2**20:.0f} МБ')
+    print(f'Кеш (mmap):      завантаження {load_time * 1000:.1f} мс, пік {load_peak / 2**20:.1f} МБ, '
+          f'dropna {drop_time * 1000:.1f} мс, task1 {new_query * 1000:.1f} мс')
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,337 @@
+import os
+import tempfile
+import operator
+
+import numpy as np
+import pandas as pd
+
+from timing import timed
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+chunk_rows = 1 << 16
+sample_rows = 10_000
+
+binary_ops = {'+': operator.add, '-': operator.sub, '*': operator.mul, '/': operator.truediv}
+compare_ops = {'>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le,
+               '==': operator.eq, '!=': operator.ne}
+
+
+# Вирази над стовпцями: col("A") + col("B") > 6 будує дерево, яке потім
+# обчислюється поблоково або через numexpr
+class Expr:
+    def __add__(self, other):
+        return BinOp('+', self, wrap(other))
+
+    def __sub__(self, other):
+        return BinOp('-', self, wrap(other))
+
+    def __mul__(self, other):
+        return BinOp('*', self, wrap(other))
+
+    def __truediv__(self, other):
+        return BinOp('/', self, wrap(other))
+
+    def __gt__(self, other):
+        return Compare('>', self, wrap(other))
+
+    def __ge__(self, other):
+        return Compare('>=', self, wrap(other))
+
+    def __lt__(self, other):
+        return Compare('<', self, wrap(other))
+
+    def __le__(self, other):
+        return Compare('<=', self, wrap(other))
+
+    def __eq__(self, other):
+        return Compare('==', self, wrap(other))
+
+    def __ne__(self, other):
+        return Compare('!=', self, wrap(other))
+
+    __hash__ = object.__hash__
+
+    def between(self, low, high):
+        return And([self >= low, self <= high])
+
+
+class Col(Expr):
+    def __init__(self, name):
+        self.name = name
+
+    def columns(self):
+        return {self.name}
+
+    def constants(self):
+        return []
+
+    def evaluate(self, env):
+        return env[self.name]
+
+    def source(self, names):
+        return names[self.name]
+
+
+class Const(Expr):
+    def __init__(self, value):
+        self.value = value
+
+    def columns(self):
+        return set()
+
+    def constants(self):
+        return [self]
+
+    def evaluate(self, env):
+        return self.value
+
+    # Константа передається в numexpr змінною (див. Query.indices_numexpr):
+    # літерал 2.0 numexpr вважає float64 і переводить стовпці float32 у float64
+    def source(self, names):
+        return names[id(self)]
+
+
+class BinOp(Expr):
+    def __init__(self, op, left, right):
+        self.op, self.left, self.right = op, left, right
+
+    def columns(self):
+        return self.left.columns() | self.right.columns()
+
+    def constants(self):
+        return self.left.constants() + self.right.constants()
+
+    def evaluate(self, env):
+        return binary_ops[self.op](self.left.evaluate(env), self.right.evaluate(env))
+
+    def source(self, names):
+        return f'({self.left.source(names)} {self.op} {self.right.source(names)})'
+
+
+def col(name):
+    return Col(name)
+
+
+def wrap(value):
+    return value if isinstance(value, Expr) else Const(value)
+
+
+class Predicate:
+    def __and__(self, other):
+        return And(self.terms() + other.terms())
+
+    def __or__(self, other):
+        return Or([self, other])
+
+    def __invert__(self):
+        return Not(self)
+
+    def terms(self):
+        return [self]
+
+
+class Compare(Predicate):
+    def __init__(self, op, left, right):
+        self.op, self.left, self.right = op, left, right
+
+    def columns(self):
+        return self.left.columns() | self.right.columns()
+
+    def constants(self):
+        return self.left.constants() + self.right.constants()
+
+    def evaluate(self, env):
+        return compare_ops[self.op](self.left.evaluate(env), self.right.evaluate(env))
+
+    def source(self, names):
+        return f'({self.left.source(names)} {self.op} {self.right.source(names)})'
+
+
+class And(Predicate):
+    def __init__(self, parts):
+        self.parts = parts
+
+    def terms(self):
+        return list(self.parts)
+
+    def columns(self):
+        return set().union(*(p.columns() for p in self.parts))
+
+    def constants(self):
+        return [c for p in self.parts for c in p.constants()]
+
+    def evaluate(self, env):
+        mask = self.parts[0].evaluate(env)
+        for part in self.parts[1:]:
+            mask &= part.evaluate(env)
+        return mask
+
+    def source(self, names):
+        return '(' + ' & '.join(p.source(names) for p in self.parts) + ')'
+
+
+class Or(Predicate):
+    def __init__(self, parts):
+        self.parts = parts
+
+    def columns(self):
+        return set().union(*(p.columns() for p in self.parts))
+
+    def constants(self):
+        return [c for p in self.parts for c in p.constants()]
+
+    def evaluate(self, env):
+        mask = self.parts[0].evaluate(env)
+        for part in self.parts[1:]:
+            mask |= part.evaluate(env)
+        return mask
+
+    def source(self, names):
+        return '(' + ' | '.join(p.source(names) for p in self.parts) + ')'
+
+
+class Not(Predicate):
+    def __init__(self, part):
+        self.part = part
+
+    def columns(self):
+        return self.part.columns()
+
+    def constants(self):
+        return self.part.constants()
+
+    def evaluate(self, env):
+        return ~self.part.evaluate(env)
+
+    def source(self, names):
+        return f'(~{self.part.source(names)})'
+
+
+# Стовпець як масив numpy: структурований масив і DataFrame мають однаковий доступ
+def column(data, name):
+    values = data[name]
+    return values.to_numpy() if isinstance(values, pd.Series) else values
+
+
+class Query:
+    def __init__(self, predicate):
+        self.predicate = predicate
+        self.terms = predicate.terms()
+
+    # Частка рядків вибірки, що проходять кожну умову; найселективніша - першою
+    def order_terms(self, data):
+        n = len(data)
+        step = max(1, n // sample_rows)
+        sample = {name: column(data, name)[::step] for name in self.predicate.columns()}
+        rates = [np.count_nonzero(term.evaluate(sample)) for term in self.terms]
+        return [self.terms[i] for i in np.argsort(rates, kind='stable')]
+
+    # Поблокове обчислення: тимчасові масиви мають розмір блоку, а наступні
+    # умови перевіряються лише для рядків, що пройшли попередні
+    def indices_chunked(self, data):
+        n = len(data)
+        terms = self.order_terms(data) if len(self.terms) > 1 else self.terms
+        columns = {name: column(data, name) for name in self.predicate.columns()}
+        found = []
+        for start in range(0, n, chunk_rows):
+            stop = min(n, start + chunk_rows)
+            env = {name: values[start:stop] for name, values in columns.items()}
+            rows = np.flatnonzero(terms[0].evaluate(env))
+            for term in terms[1:]:
+                if len(rows) == 0:
+                    break
+                subset = {name: values[rows] for name, values in env.items() if name in term.columns()}
+                rows = rows[term.evaluate(subset)]
+            found.append(rows + start)
+        return np.concatenate(found) if found else np.array([], dtype=np.int64)
+
+    # Злите обчислення всього виразу через numexpr (якщо встановлено). Константи
+    # мають тип, який numpy дав би скаляру Python поруч зі стовпцями (float32 для
+    # кешу), тож результат збігається з рушіями numpy і chunked
+    def indices_numexpr(self, data):
+        names = {name: f'c{i}' for i, name in enumerate(sorted(self.predicate.columns()))}
+        local = {alias: column(data, name) for name, alias in names.items()}
+        dtype = np.result_type(*local.values()) if local else None
+        for i, const in enumerate(self.predicate.constants()):
+            names[id(const)] = f'k{i}'
+            const_dtype = np.result_type(dtype, const.value) if dtype is not None else None
+            local[f'k{i}'] = np.asarray(const.value, dtype=const_dtype)
+        return np.flatnonzero(numexpr.evaluate(self.predicate.source(names), local_dict=local))
+
+    def indices(self, data, engine=None):
+        if engine is None:
+            engine = 'numexpr' if numexpr is not None else 'chunked'
+        if engine == 'numexpr':
+            return self.indices_numexpr(data)
+        if engine == 'numpy':
+            env = {name: column(data, name) for name in self.predicate.columns()}
+            return np.flatnonzero(self.predicate.evaluate(env))
+        return self.indices_chunked(data)
+
+    def select(self, data, engine=None):
+        rows = self.indices(data, engine)
+        return data.iloc[rows] if isinstance(data, pd.DataFrame) else data[rows]
+
+    def count(self, data, engine=None):
+        return len(self.indices(data, engine))
+
+
+def where(predicate):
+    return Query(predicate)
+
+
+# Завдання 1-3 з Lab4.ipynb як запити
+task1 = where(col('Global_active_power') > 5)
+task2 = where(col('Voltage') > 235)
+task3 = where(col('Global_intensity').between(19, 20) & (col('Sub_metering_2') > col('Sub_metering_3')))
+
+# Арифметичний запит: перевірка, що всі рушії (і типи констант у numexpr) дають ті самі рядки
+arithmetic = where(col('Global_active_power') * 2 >= col('Global_intensity') / 3)
+
+
+# Поточні реалізації з Lab4.ipynb (масив об'єктів / DataFrame), залишені для порівняння
+legacy_tasks = {
+    'task1': (lambda d: d[d[:, 2].astype(float) > 5], lambda d: d[d['Global_active_power'] > 5]),
+    'task2': (lambda d: d[d[:, 4] > 235], lambda d: d[d['Voltage'] > 235]),
+    'task3': (lambda d: d[(d[:, 5] >= 19) & (d[:, 5] <= 20) & (d[:, 7] > d[:, 8])],
+              lambda d: d[(d['Global_intensity'] >= 19) & (d['Global_intensity'] <= 20) &
+                          (d['Sub_metering_2'] > d['Sub_metering_3'])]),
+}
+
+
+def benchmark(path=None, n_rows=2_000_000):
+    from lab4_power import generate_power_csv, load_power, to_frame, object_array_path
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if path is None:
+            path = os.path.join(tmp, 'power.csv')
+            generate_power_csv(path, n_rows)
+        data_np = object_array_path(path)
+        data_df = pd.read_csv(path, na_values='?').dropna()
+        table = load_power(path, mmap=False)
+        frame = to_frame(table)
+
+    engines = ['numpy', 'chunked'] + (['numexpr'] if numexpr is not None else [])
+    for name, query in [('task1', task1), ('task2', task2), ('task3', task3)]:
+        old_np, old_np_time = timed(legacy_tasks[name][0], data_np)
+        old_df, old_df_time = timed(legacy_tasks[name][1], data_df)
+        line = f'{name}: об\'єкти {old_np_time * 1000:.1f} мс, DataFrame {old_df_time * 1000:.1f} мс'
+        for engine in engines:
+            rows, elapsed = timed(query.select, table, engine)
+            _, df_elapsed = timed(query.select, frame, engine)
+            line += f'; {engine} {elapsed * 1000:.1f}/{df_elapsed * 1000:.1f} мс'
+        print(line + f' (рядків {len(old_np)} / {len(old_df)} / {len(rows)})')
+
+    expected = arithmetic.indices(table, 'numpy')
+    for data in (table, frame):
+        for engine in engines:
+            assert np.array_equal(arithmetic.indices(data, engine), expected), engine
+    print(f'Арифметичний запит: рушії {", ".join(engines)} збігаються (рядків {len(expected)})')
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,179 @@
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from lab4_power import read_csv_chunks, chunk_to_table, missing_mask
+from lab4_chunked import row_keys, chunk_ranges, default_chunk_rows
+from timing import timed
+
+sub_metering = ['Sub_metering_1', 'Sub_metering_2', 'Sub_metering_3']
+
+
+# Індекси k рядків без повторень (Generator.choice не переставляє весь діапазон),
+# відсортовані для послідовного доступу до пам'яті
+def sample_indices(n, k, seed=0):
+    return np.sort(np.random.default_rng(seed).choice(n, size=k, replace=False))
+
+
+def valid_rows(data):
+    if isinstance(data, pd.DataFrame):
+        return np.flatnonzero(data['Global_active_power'].notna().to_numpy())
+    return np.flatnonzero(~missing_mask(data))
+
+
+# Середні по вибірці без копіювання вибраних рядків: береться лише потрібний стовпець
+def sample_means(data, k, columns=sub_metering, seed=0, dropna=True):
+    if dropna:
+        valid = valid_rows(data)
+        rows = valid[sample_indices(len(valid), k, seed)]
+    else:
+        rows = sample_indices(len(data), k, seed)
+    means = {}
+    for name in columns:
+        values = data[name].to_numpy() if isinstance(data, pd.DataFrame) else data[name]
+        means[name] = values.take(rows).mean(dtype=np.float64)
+    return means
+
+
+# Резервуарна вибірка за один прохід (алгоритм R, векторизований по частинах):
+# рядок з глобальним номером i потрапляє в резервуар з імовірністю k/(i+1)
+class Reservoir:
+    def __init__(self, k, seed=0, columns=None):
+        self.k = k
+        self.columns = columns
+        self.rng = np.random.default_rng(seed)
+        self.seen = 0
+        self.items = None
+
+    def add(self, chunk):
+        if self.columns is not None:
+            chunk = np.column_stack([chunk[name] for name in self.columns])
+        if self.items is None:
+            self.items = np.empty((self.k,) + chunk.shape[1:], dtype=chunk.dtype)
+        fill = min(max(self.k - self.seen, 0), len(chunk))
+        self.items[self.seen:self.seen + fill] = chunk[:fill]
+
+        positions = np.arange(fill, len(chunk))
+        if len(positions):
+            index = self.seen + positions
+            accepted = positions[self.rng.random(len(positions)) < self.k / (index + 1)]
+            slots = self.rng.integers(0, self.k, len(accepted))
+            # якщо слот замінюється кілька разів, залишається остання заміна
+            _, last = np.unique(slots[::-1], return_index=True)
+            keep = len(slots) - 1 - last
+            self.items[slots[keep]] = chunk[accepted[keep]]
+        self.seen += len(chunk)
+
+    def result(self):
+        return self.items[:min(self.k, self.seen)]
+
+    def means(self):
+        items = self.result()
+        return dict(zip(self.columns, items.mean(axis=0, dtype=np.float64)))
+
+
+def reservoir_sample(chunks, k, seed=0, columns=None, dropna=True):
+    reservoir = Reservoir(k, seed, columns)
+    for chunk in chunks:
+        if dropna:
+            chunk = chunk[~np.isnan(chunk['Global_active_power'])]
+        reservoir.add(chunk)
+    return reservoir
+
+
+# Резервуарна вибірка по файлу (.npy або CSV) частинами; з columns у резервуарі
+# зберігаються лише ці стовпці, тож середні рахуються без копій цілих рядків
+def reservoir_from_file(path, k, seed=0, columns=None, dropna=True, chunk_rows=default_chunk_rows):
+    if path.endswith('.csv'):
+        chunks = (chunk_to_table(chunk) for chunk in read_csv_chunks(path, chunk_rows))
+    else:
+        table = np.load(path, mmap_mode='r')
+        chunks = (table[start:stop] for start, stop in chunk_ranges(len(table), chunk_rows))
+    return reservoir_sample(chunks, k, seed, columns, dropna)
+
+
+# Розподіл k між стратами пропорційно їхнім розмірам (метод найбільших залишків)
+def allocate(sizes, k):
+    exact = sizes * k / sizes.sum()
+    counts = np.floor(exact).astype(np.int64)
+    remainder = k - counts.sum()
+    counts[np.argsort(-(exact - counts), kind='stable')[:remainder]] += 1
+    return np.minimum(counts, sizes)
+
+
+# Стратифікована вибірка: у кожній страті беруться рядки з найменшими ключами
+def stratified_indices(strata, k, seed=0):
+    strata = np.asarray(strata)
+    keys = row_keys(seed, 0, len(strata))
+    order = np.lexsort((keys, strata))
+    values, starts, sizes = np.unique(strata[order], return_index=True, return_counts=True)
+    counts = allocate(sizes, k)
+    offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(counts)[:-1])), counts)
+    picks = np.arange(counts.sum()) + offsets
+    return np.sort(order[picks])
+
+
+def strata_of(data, by='Hour'):
+    if by == 'Day':
+        stamps = data['Timestamp'].to_numpy() if isinstance(data, pd.DataFrame) else data['Timestamp']
+        return stamps.astype('datetime64[D]').astype(np.int64)
+    return data[by].to_numpy() if isinstance(data, pd.DataFrame) else data[by]
+
+
+def stratified_sample(data, k, by='Hour', seed=0):
+    rows = stratified_indices(strata_of(data, by), k, seed)
+    return data.iloc[rows] if isinstance(data, pd.DataFrame) else data[rows]
+
+
+# 4. Середні трьох груп споживання для 500000 випадкових рядків (без повторів)
+def task4_np(table, k=500_000, seed=0):
+    return np.array(list(sample_means(table, k, sub_metering, seed).values()))
+
+
+def task4_df(data_df, k=500_000, seed=0):
+    return pd.Series(sample_means(data_df, k, sub_metering, seed))
+
+
+# Поточні реалізації з Lab4.ipynb, залишені для порівняння
+def task4_np_choice(data_np, k=500_000):
+    random_indices = np.random.choice(data_np.shape[0], size=k, replace=False)
+    random_sample_np = data_np[random_indices]
+    return np.mean(random_sample_np[:, 6:9].astype(float), axis=0)
+
+
+def task4_df_sample(data_df, k=500_000):
+    random_sample_df = data_df.sample(n=k, replace=False)
+    return random_sample_df[sub_metering].mean()
+
+
+def benchmark(path=None, n_rows=2_000_000):
+    from lab4_power import generate_power_csv, load_power, to_frame, object_array_path, cache_path
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if path is None:
+            path = os.path.join(tmp, 'power.csv')
+            generate_power_csv(path, n_rows)
+        data_np = object_array_path(path)
+        data_df = pd.read_csv(path, na_values='?').dropna()
+        table = load_power(path, mmap=False)
+        frame = to_frame(table)
+
+        old_np, old_np_time = timed(task4_np_choice, data_np)
+        old_df, old_df_time = timed(task4_df_sample, data_df)
+        new_np, new_np_time = timed(task4_np, table)
+        new_df, new_df_time = timed(task4_df, frame)
+        reservoir, reservoir_time = timed(reservoir_from_file, cache_path(path),
+                                          500_000, 0, sub_metering)
+        _, strata_time = timed(stratified_sample, table, 500_000, 'Hour')
+
+    print(f'Середні: {old_np.round(3)} / {new_np.round(3)} / {np.round(list(reservoir.means().values()), 3)}')
+    print(f'task4_np: np.random.choice {old_np_time * 1000:.1f} мс -> sample_means {new_np_time * 1000:.1f} мс')
+    print(f'task4_df: data.sample {old_df_time * 1000:.1f} мс -> sample_means {new_df_time * 1000:.1f} мс')
+    print(f'Резервуар по .npy частинами {reservoir_time * 1000:.1f} мс, '
+          f'стратифікована за годиною {strata_time * 1000:.1f} мс')
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,254 @@
+import numpy as np
+import pandas as pd
+
+from timing import timed
+
+# Стовпці набору heart_disease, що нормуються в Lab4.ipynb (імена і номери в масиві)
+heart_columns = ['chol', 'thalach', 'oldpeak', 'ca']
+heart_indices = [4, 7, 9, 11]
+heart_features = ['age', 'sex', 'cp', 'trestbps', 'chol', 'fbs', 'restecg', 'thalach',
+                  'exang', 'oldpeak', 'slope', 'ca', 'thal']
+
+
+# Вибрані стовпці як двовимірний float-масив
+def select(data, columns):
+    if isinstance(data, pd.DataFrame):
+        return data[columns].to_numpy(dtype=np.float64, copy=True)
+    return np.asarray(data[:, columns], dtype=np.float64)
+
+
+# Статистики по стовпцях за один прохід: кількість, середнє, M2 (Велфорд) і
+# мінімум/максимум; NaN пропускаються. Блоки (і окремі накопичувачі) зливаються
+# формулою Чана, тож порядок і розмір частин на результат не впливають
+class ColumnStats:
+    def __init__(self, n_columns, moments=True):
+        self.moments = moments
+        self.count = np.zeros(n_columns, dtype=np.int64)
+        self.mean = np.zeros(n_columns)
+        self.m2 = np.zeros(n_columns)
+        self.min = np.full(n_columns, np.inf)
+        self.max = np.full(n_columns, -np.inf)
+
+    def update(self, block):
+        if len(block) == 0:
+            return self
+        if not np.isnan(block.sum(axis=0)).any():
+            # частина без пропусків - без масок
+            count = np.full(block.shape[1], len(block), dtype=np.int64)
+            low, high = block.min(axis=0), block.max(axis=0)
+            if self.moments:
+                mean = block.mean(axis=0)
+                m2 = ((block - mean) ** 2).sum(axis=0)
+        else:
+            valid = ~np.isnan(block)
+            count = valid.sum(axis=0)
+            low = np.where(valid, block, np.inf).min(axis=0)
+            high = np.where(valid, block, -np.inf).max(axis=0)
+            if self.moments:
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    mean = np.nan_to_num(np.where(valid, block, 0.0).sum(axis=0) / count)
+                m2 = (np.where(valid, block - mean, 0.0) ** 2).sum(axis=0)
+        if self.moments:
+            self.combine(count, mean, m2)
+        else:
+            self.count = self.count + count
+        self.min = np.fmin(self.min, low)
+        self.max = np.fmax(self.max, high)
+        return self
+
+    def combine(self, count, mean, m2):
+        total = self.count + count
+        delta = mean - self.mean
+        with np.errstate(invalid='ignore', divide='ignore'):
+            share = np.where(total > 0, count / total, 0.0)
+        self.mean = self.mean + delta * share
+        self.m2 = self.m2 + m2 + delta ** 2 * self.count * share
+        self.count = total
+
+    def merge(self, other):
+        self.combine(other.count, other.mean, other.m2)
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        return self
+
+    def variance(self, ddof=0):
+        return self.m2 / np.maximum(self.count - ddof, 1)
+
+    def std(self, ddof=0):
+        return np.sqrt(self.variance(ddof))
+
+
+# Спільна частина нормалізатора і стандартизатора: (x - offset) / scale для всіх
+# вибраних стовпців одразу. partial_fit можна викликати для кожної частини даних,
+# а transform застосовує вже навчені параметри до нових даних
+class Scaler:
+    moments = True
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.reset()
+
+    def reset(self):
+        self.stats = ColumnStats(len(self.columns), self.moments)
+        self.offset = None
+        self.scale = None
+
+    def update(self, block):
+        self.stats.update(block)
+        self.offset, self.scale = self.parameters()
+        # сталий стовпець не ділиться на нуль
+        self.scale = np.where(self.scale > 0, self.scale, 1.0)
+
+    # Накопичення: кожен виклик додає частину до вже навчених статистик
+    def partial_fit(self, data):
+        self.update(select(data, self.columns))
+        return self
+
+    # Навчання з нуля: попередні статистики відкидаються
+    def fit(self, data):
+        self.reset()
+        if isinstance(data, (pd.DataFrame, np.ndarray)):
+            data = [data]
+        for block in data:
+            self.partial_fit(block)
+        return self
+
+    # Стовпці джерела без копій: стовпець DataFrame або зріз масиву
+    def source_columns(self, data):
+        if isinstance(data, pd.DataFrame):
+            return [data[name].to_numpy() for name in self.columns]
+        return [data[:, column] for column in self.columns]
+
+    def store(self, data, out):
+        if isinstance(data, pd.DataFrame):
+            for i, name in enumerate(self.columns):
+                data[name] = out[:, i]
+        else:
+            data[:, self.columns] = out
+        return data
+
+    def apply(self, data, block, inplace):
+        np.subtract(block, self.offset, out=block)
+        np.divide(block, self.scale, out=block)
+        return self.store(data, block) if inplace else block
+
+    # out - буфер (n x len(columns)): кожен стовпець обчислюється прямо з джерела
+    # в out[:, i], без проміжної копії. inplace=True записує результат у самі
+    # стовпці data (масив numpy змінюється на місці, він має бути float)
+    def transform(self, data, out=None, inplace=False):
+        if out is not None:
+            for i, values in enumerate(self.source_columns(data)):
+                np.subtract(values, self.offset[i], out=out[:, i])
+                np.divide(out[:, i], self.scale[i], out=out[:, i])
+            return self.store(data, out) if inplace else out
+        if inplace and isinstance(data, np.ndarray):
+            for i, values in enumerate(self.source_columns(data)):
+                np.subtract(values, self.offset[i], out=values)
+                np.divide(values, self.scale[i], out=values)
+            return data
+        return self.apply(data, select(data, self.columns), inplace)
+
+    def inverse_transform(self, values, out=None):
+        out = np.multiply(values, self.scale, out=out)
+        out += self.offset
+        return out
+
+    # Навчання з нуля і перетворення; без out стовпці вибираються один раз
+    def fit_transform(self, data, out=None, inplace=False):
+        if out is not None or (inplace and isinstance(data, np.ndarray)):
+            return self.fit(data).transform(data, out, inplace)
+        self.reset()
+        block = select(data, self.columns)
+        self.update(block)
+        return self.apply(data, block, inplace)
+
+
+class MinMaxNormalizer(Scaler):
+    moments = False
+
+    def parameters(self):
+        return self.stats.min, self.stats.max - self.stats.min
+
+
+class Standardizer(Scaler):
+    def __init__(self, columns, ddof=0):
+        super().__init__(columns)
+        self.ddof = ddof
+
+    def parameters(self):
+        return self.stats.mean, self.stats.std(self.ddof)
+
+
+# Нормалізація і стандартизація як окремі функції (завдання 2 другого рівня)
+def normalize(data, columns, inplace=False):
+    return MinMaxNormalizer(columns).fit_transform(data, inplace=inplace)
+
+
+def standardize(data, columns, inplace=False):
+    return Standardizer(columns).fit_transform(data, inplace=inplace)
+
+
+# Поточні реалізації з Lab4.ipynb, залишені для порівняння
+def normalize_loop_df(df, columns=heart_columns):
+    for column in columns:
+        min_val = df[column].min()
+        max_val = df[column].max()
+        df[column] = (df[column] - min_val) / (max_val - min_val)
+    return df
+
+
+def normalize_loop_np(data_np, columns=heart_indices):
+    for column in columns:
+        min_val = data_np[:, column].min()
+        max_val = data_np[:, column].max()
+        data_np[:, column] = (data_np[:, column] - min_val) / (max_val - min_val)
+    return data_np
+
+
+# Синтетичний набір у форматі heart_disease (ucimlrepo id=45) для перевірок і бенчмарків
+def generate_heart(n_rows, seed=0, missing=0.01):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'age': rng.integers(29, 78, n_rows),
+        'sex': rng.integers(0, 2, n_rows),
+        'cp': rng.integers(1, 5, n_rows),
+        'trestbps': rng.normal(131, 17, n_rows).round(),
+        'chol': rng.normal(246, 51, n_rows).round(),
+        'fbs': (rng.random(n_rows) < 0.15).astype(int),
+        'restecg': rng.integers(0, 3, n_rows),
+        'thalach': rng.normal(150, 23, n_rows).round(),
+        'exang': (rng.random(n_rows) < 0.33).astype(int),
+        'oldpeak': rng.gamma(1.0, 1.0, n_rows).round(1),
+        'slope': rng.integers(1, 4, n_rows),
+        'ca': rng.integers(0, 4, n_rows).astype(float),
+        'thal': rng.choice([3.0, 6.0, 7.0], n_rows),
+    }, columns=heart_features).astype(float)
+    df.loc[rng.random(n_rows) < missing, 'ca'] = np.nan
+    df.loc[rng.random(n_rows) < missing, 'thal'] = np.nan
+    return df
+
+
+def benchmark(n_rows=5_000_000, chunk_rows=1 << 18):
+    df = generate_heart(n_rows).dropna().reset_index(drop=True)
+    data_np = df.to_numpy()
+
+    old_df, old_df_time = timed(normalize_loop_df, df.copy())
+    old_np, old_np_time = timed(normalize_loop_np, data_np.copy())
+    new_df, new_df_time = timed(normalize, df.copy(), heart_columns, inplace=True)
+    new_np, new_np_time = timed(normalize, data_np.copy(), heart_indices, inplace=True)
+
+    # навчання частинами, потім перетворення в заздалегідь виділений буфер
+    scaler = MinMaxNormalizer(heart_indices)
+    _, fit_time = timed(scaler.fit, (data_np[i:i + chunk_rows] for i in range(0, len(data_np), chunk_rows)))
+    out = np.empty((len(data_np), len(heart_indices)))
+    _, out_time = timed(scaler.transform, data_np, out)
+
+    assert np.allclose(old_df[heart_columns].to_numpy(), new_df[heart_columns].to_numpy())
+    assert np.allclose(old_np, new_np) and np.allclose(out, new_np[:, heart_indices])
+    print(f'DataFrame: цикл {old_df_time * 1000:.1f} мс -> MinMaxNormalizer {new_df_time * 1000:.1f} мс')
+    print(f'numpy:     цикл {old_np_time * 1000:.1f} мс -> MinMaxNormalizer {new_np_time * 1000:.1f} мс')
+    print(f'Частинами: fit {fit_time * 1000:.1f} мс, transform в out {out_time * 1000:.1f} мс')
+
+
+if __name__ == '__main__':
+    benchmark()
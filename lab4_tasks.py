@@ -0,0 +1,97 @@
+import tempfile
+import os
+
+import numpy as np
+import pandas as pd
+
+from lab4_power import generate_power_csv, load_power, to_frame, object_array_path, TimeIndex
+from timing import timed
+
+sub_metering = ['Sub_metering_1', 'Sub_metering_2', 'Sub_metering_3']
+
+
+# Кожен третій результат з першої половини і кожен четвертий з другої
+def thin_halves(rows):
+    half = len(rows) // 2
+    return rows[:half:3], rows[half::4]
+
+
+# 5. Після 18:00 понад 6 кВт, сумарне споживання груп більше 6 - на типізованій
+# таблиці година вже є цілим стовпцем, тож немає розбору рядків часу
+def task5_np(table, time_index=None):
+    if time_index is None:
+        evening = table['Hour'] >= 18
+    else:
+        evening = np.zeros(len(table), dtype=bool)
+        evening[time_index.after(18)] = True
+    power_consumption = table[evening & (table['Global_active_power'] > 6)]
+    filtered_data = power_consumption[(power_consumption['Sub_metering_1'] +
+                                       power_consumption['Sub_metering_2'] +
+                                       power_consumption['Sub_metering_3']) > 6]
+    return np.concatenate(thin_halves(filtered_data))
+
+
+def task5_df(data_df):
+    filtered_data = data_df[(data_df['Hour'] >= 18) & (data_df['Global_active_power'] > 6)]
+    filtered_data = filtered_data[filtered_data[sub_metering].sum(axis=1) > 6]
+    half = len(filtered_data) // 2
+    return pd.concat([filtered_data.iloc[:half:3], filtered_data.iloc[half::4]])
+
+
+# Поточні реалізації з Lab4.ipynb, залишені для порівняння
+def task5_np_strings(data_np):
+    power_consumption = data_np[(np.array([int(time.split(':')[0]) for time in data_np[:, 1]]) >= 18) & (data_np[:, 2].astype(float) > 6)]
+
+    filtered_data = power_consumption[(power_consumption[:, 6].astype(float) +
+                                       power_consumption[:, 7].astype(float) +
+                                       power_consumption[:, 8].astype(float)) > 6]
+
+    result = np.concatenate([filtered_data[:len(filtered_data) // 2:3], filtered_data[len(filtered_data) // 2::4]])
+
+    return result
+
+
+def task5_df_strings(data_df):
+
+    data_df['DateTime'] = pd.to_datetime(data_df['Date'] + ' ' + data_df['Time'], format='%d/%m/%Y %H:%M:%S')
+
+    filtered_data = data_df[(data_df['DateTime'].dt.hour >= 18) &
+                                  (data_df['Global_active_power'].astype(float) > 6)]
+
+    filtered_data = filtered_data[(filtered_data['Sub_metering_1'] +
+                                   filtered_data['Sub_metering_2'] +
+                                   filtered_data['Sub_metering_3']) > 6]
+
+    first_half = filtered_data.iloc[:len(filtered_data)//2]
+    second_half = filtered_data.iloc[len(filtered_data)//2:]
+
+    result = pd.concat([first_half.iloc[::3], second_half.iloc[::4]])
+
+    return result
+
+
+def benchmark(path=None, n_rows=2_000_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        if path is None:
+            path = os.path.join(tmp, 'power.csv')
+            generate_power_csv(path, n_rows)
+        data_np = object_array_path(path)
+        data_df = pd.read_csv(path, na_values='?').dropna()
+        table = load_power(path, mmap=False)
+        frame = to_frame(table).dropna()
+        time_index = TimeIndex(table)
+
+        old_np, old_np_time = timed(task5_np_strings, data_np)
+        old_df, old_df_time = timed(task5_df_strings, data_df)
+        new_np, new_np_time = timed(task5_np, table)
+        _, index_time = timed(task5_np, table, time_index)
+        new_df, new_df_time = timed(task5_df, frame)
+
+    print(f'Рядків у результаті: {len(old_np)} / {len(new_np)}, {len(old_df)} / {len(new_df)}')
+    print(f'task5_np: рядки часу {old_np_time:.3f} с -> стовпець Hour {new_np_time * 1000:.1f} мс, '
+          f'TimeIndex {index_time * 1000:.1f} мс')
+    print(f'task5_df: pd.to_datetime {old_df_time:.3f} с -> стовпець Hour {new_df_time * 1000:.1f} мс')
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -1,37 +1,21 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Slider, Button, CheckButtons
-import scipy.signal as sig
-
-# Функція гармоніки зі шумом
-def harmonic_with_noise(t, amplitude, frequency, phase, noise_mean=None, noise_covariance=None):
-    global previous_noise, previous_noise_mean, previous_noise_covariance
-    
-    if noise_mean is None:
-        noise_mean = previous_noise_mean
-    if noise_covariance is None:
-        noise_covariance = previous_noise_covariance
-
-    if (noise_mean != previous_noise_mean or
-        noise_covariance != previous_noise_covariance):
-        
-        previous_noise_mean = noise_mean
-        previous_noise_covariance = noise_covariance
-
-        previous_noise = np.random.normal(noise_mean, np.sqrt(noise_covariance), len(t))
-    
-    noise = previous_noise
-    return amplitude * np.sin(2 * np.pi * frequency * t + phase) + noise
+
+import lab5_butterworth
+import lab5_recompute
+import lab5_lod
+from lab5_noise import noise_bank
 
 # Функція гармоніки без шуму
 def harmonic(t, amplitude, frequency, phase):
     return amplitude * np.sin(2 * np.pi * frequency * t + phase)
 
 # Функція для відфільтрування сигналу за допомогою фільтру Баттерворта
+# (проєкт фільтра береться з LRU-кешу, див. lab5_butterworth)
 def butterworth_filter(signal, fs, cutoff_freq):
     order = 4 
-    b, a = sig.butter(order, cutoff_freq / (fs / 2), btype='low')
-    return sig.filtfilt(b, a, signal)
+    return lab5_butterworth.butterworth_filter(signal, fs, cutoff_freq, order)
 
 # Початкові значення параметрів
 initial_amplitude = 1.0
@@ -42,9 +26,8 @@ initial_noise_covariance = 0.1
 show_noise = True
 cutoff_freq = 60.0
 
-previous_noise = None
-previous_noise_mean = None
-previous_noise_covariance = None
+session = 'lab5'
+noise_seed = 0
 
 #часовий ряд
 t = np.linspace(0, 10, 1000)
@@ -54,13 +37,36 @@ fs = 1000
 fig, ax = plt.subplots()
 plt.subplots_adjust(left=0.25, bottom=0.5)
 
+# Етапи обчислення з мемоізацією: кожен залежить лише від своїх параметрів
+graph = lab5_recompute.RecomputeGraph(
+    amplitude=initial_amplitude, frequency=initial_frequency, phase=initial_phase,
+    noise_mean=initial_noise_mean, noise_covariance=initial_noise_covariance, cutoff_freq=cutoff_freq)
+# шум береться з банку: зміна середнього чи дисперсії лише перетворює вже
+# згенерований стандартний нормальний вектор
+graph.stage('noise', lambda mean, covariance: noise_bank.noise(session, len(t), mean, covariance, noise_seed),
+            params=('noise_mean', 'noise_covariance'))
+graph.stage('clean', lambda amplitude, frequency, phase: harmonic(t, amplitude, frequency, phase),
+            params=('amplitude', 'frequency', 'phase'))
+graph.stage('noisy', lambda clean, noise: clean + noise, inputs=('clean', 'noise'))
+graph.stage('filtered', lambda cutoff, noisy: butterworth_filter(noisy, fs, cutoff),
+            params=('cutoff_freq',), inputs=('noisy',))
+# піраміди min/max для ліній - теж етапи: перебудовуються лише зі своїм сигналом
+for name in ['noisy', 'filtered', 'clean']:
+    graph.stage(f'{name}_lod', lambda y: lab5_lod.LODSignal(t, y), inputs=(name,))
+
 # Побудова графіку
-initial_signal = harmonic_with_noise(t, initial_amplitude, initial_frequency, initial_phase, initial_noise_mean, initial_noise_covariance)
+initial_signal = graph['noisy']
 l, = plt.plot(t, initial_signal, lw=2, linestyle ='--', color='red')
 l_filtered, = plt.plot(t, initial_signal, lw=2, color='blue', alpha=0.5)
-l_harmonic, = plt.plot(t, harmonic(t, initial_amplitude, initial_frequency, initial_phase), lw=2, color='green', linestyle='--')
+l_harmonic, = plt.plot(t, graph['clean'], lw=2, color='green', linestyle='--')
 l_harmonic.set_visible(False)
 
+# Рівні деталізації: на лінію потрапляє лише ~2 точки на піксель видимого
+# діапазону, а при масштабуванні дані перезапитуються з піраміди min/max
+l_lod = lab5_lod.LODLine(ax, l, graph['noisy_lod'])
+l_filtered_lod = lab5_lod.LODLine(ax, l_filtered, graph['noisy_lod'])
+l_harmonic_lod = lab5_lod.LODLine(ax, l_harmonic, graph['clean_lod'])
+
 # Створення слайдерів
 axcolor = 'lightgreen'
 ax_amplitude = plt.axes([0.25, 0.4, 0.65, 0.03], facecolor=axcolor)
@@ -78,35 +84,40 @@ s_noise_covariance = Slider(ax_noise_covariance, 'Noise Covariance', 0.01, 1.0,
 s_cutoff_freq = Slider(ax_cutoff_freq, 'Cutoff Frequency', 1, 100, valinit=cutoff_freq)
 
 # Функція оновлення графіку при зміні параметрів
-def update(val):
-    amplitude = s_amplitude.val
-    frequency = s_frequency.val
-    phase = s_phase.val
-    noise_mean = s_noise_mean.val
-    noise_covariance = s_noise_covariance.val
-    cutoff_freq = s_cutoff_freq.val
-    
+def redraw():
     if show_noise:
-        signal_with_noise = harmonic_with_noise(t, amplitude, frequency, phase, noise_mean, noise_covariance)
-        l.set_ydata(signal_with_noise)
+        l_lod.set_signal(graph['noisy_lod'])
 
         # Відфільтрований сигнал
-        filtered_signal = butterworth_filter(signal_with_noise, fs, cutoff_freq)
-        l_filtered.set_ydata(filtered_signal)
+        l_filtered_lod.set_signal(graph['filtered_lod'])
         l_filtered.set_visible(True)  # Показуємо лінію l_filtered
-        clean_signal = harmonic(t, amplitude, frequency, phase)
-        l_harmonic.set_ydata(clean_signal)
+        l_harmonic_lod.set_signal(graph['clean_lod'])
         l_harmonic.set_visible(True)
     else:
         # Чистий сигнал без шуму
-        clean_signal = harmonic(t, amplitude, frequency, phase)
-        l.set_ydata(clean_signal)
+        clean_signal = graph['clean_lod']
+        l_lod.set_signal(clean_signal)
         l_filtered.set_visible(False)  # Приховуємо лінію l_filtered
-        l_harmonic.set_ydata(clean_signal)
+        l_harmonic_lod.set_signal(clean_signal)
         l_harmonic.set_visible(True)
 
     fig.canvas.draw_idle()
 
+# Події слайдерів лише оновлюють параметри; перерахунок і перемальовування
+# виконуються один раз для серії подій
+coalescer = lab5_recompute.RedrawCoalescer(fig.canvas, redraw)
+
+def update(val):
+    graph.update(
+        amplitude=s_amplitude.val,
+        frequency=s_frequency.val,
+        phase=s_phase.val,
+        noise_mean=s_noise_mean.val,
+        noise_covariance=s_noise_covariance.val,
+        cutoff_freq=s_cutoff_freq.val,
+    )
+    coalescer.request()
+
 
 s_amplitude.on_changed(update)
 s_frequency.on_changed(update)
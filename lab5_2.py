@@ -1,8 +1,16 @@
+import uuid
+import base64
+
 import numpy as np
 import plotly.graph_objs as go
 import dash
-from dash import dcc, html
-from dash.dependencies import Input, Output
+from dash import dcc, html, Patch
+from dash.dependencies import Input, Output, State
+
+from lab5_filters import moving_average
+from lab5_noise import noise_bank
+from lab5_cache import TTLCache
+from lab5_lod import LODSignal, relayout_range
 
 # Початкові значення параметрів
 initial_amplitude = 1.0
@@ -10,129 +18,185 @@ initial_frequency = 1.0
 initial_phase = 0.0
 initial_noise_mean = 0.0
 initial_noise_covariance = 0.1
+initial_window = 10
 show_noise = True
 
-previous_noise = None
-previous_noise_mean = None
-previous_noise_covariance = None
+noise_seed = 0
+
+# Розмір запису кешу: сигнали разом з їхніми пірамідами (y у них спільний)
+def signals_nbytes(signals):
+    return sum(lod.nbytes for lod in signals['lod'].values())
+
+# Серверний кеш обчислених масивів (LRU з часом життя); піраміди роблять записи
+# великими, тож кеш обмежено і за сумарним розміром
+signal_cache = TTLCache(maxsize=128, ttl=300, max_bytes=256 * 2**20, sizeof=signals_nbytes)
 
 # Згенеруємо часовий ряд
 t = np.linspace(0, 10, 1000)
 
-# Фільтр для сигналу
+# Приблизна ширина графіка в пікселях для вибору рівня деталізації
+plot_width = 1000
+
+# Фільтр для сигналу (ковзне середнє через кумулятивну суму, O(n))
 def my_filter(signal, window_size=5):
-    filtered_signal = np.zeros_like(signal)
-    half_window = window_size // 2
-    
-    for i in range(len(signal)):
-        start = max(0, i - half_window)
-        end = min(len(signal), i + half_window + 1)
-        filtered_signal[i] = np.mean(signal[start:end])
-    
-    return filtered_signal
+    return moving_average(signal, window_size)
+
+# Шум для сесії: зміна середнього чи дисперсії не викликає генератор
+def session_noise(session_id, noise_mean, noise_covariance):
+    return noise_bank.noise(session_id, len(t), noise_mean, noise_covariance, noise_seed)
+
+# Одне обчислення на набір параметрів; результат спільний для обох графіків
+def compute_signals(session_id, amplitude, frequency, phase, noise_mean, noise_covariance, window):
+    noise = session_noise(session_id, noise_mean, noise_covariance)
+    clean_signal = amplitude * np.sin(2 * np.pi * frequency * t + phase)
+    signals = {
+        'clean': clean_signal,
+        'noisy': clean_signal + noise,
+        'filtered': clean_signal + my_filter(noise, window),
+    }
+    # Піраміди min/max: браузер отримує лише ~2 точки на піксель видимого діапазону
+    signals['lod'] = {name: LODSignal(t, values) for name, values in list(signals.items())}
+    return signals
+
+def cached_signals(session_id, amplitude, frequency, phase, noise_mean, noise_covariance, window):
+    key = (session_id, amplitude, frequency, phase, noise_mean, noise_covariance, window)
+    return signal_cache.get_or_compute(key, compute_signals, *key)
 
 # Створення головного вікна
 app = dash.Dash(__name__)
 
-app.layout = html.Div([
-    dcc.Graph(id='graph'),
-    html.Div([
-        html.Label('Amplitude'),
-        dcc.Slider(id='amplitude-slider', min=0.1, max=2, step=0.1, value=initial_amplitude),
-        html.Label('Frequency'),
-        dcc.Slider(id='frequency-slider', min=0.1, max=2, step=0.1, value=initial_frequency),
-        html.Label('Phase'),
-        dcc.Slider(id='phase-slider', min=0.0, max=2 * np.pi, step=0.1, value=initial_phase),
-        html.Label('Noise Mean'),
-        dcc.Slider(id='noise-mean-slider', min=-1.0, max=1.0, step=0.1, value=initial_noise_mean),
-        html.Label('Noise Covariance'),
-        dcc.Slider(id='noise-covariance-slider', min=0.1, max=1.0, step=0.1, value=initial_noise_covariance),
-        html.Label('Window'),
-        dcc.Slider(id='window', min=1, max=100, step=1, value=10),
-        html.Label('Show Noise'),
-        dcc.Checklist(id='show-noise-checkbox', options=[{'label': 'Show Noise', 'value': 'show'}], value=['show']),
-        html.Button('Reset', id='reset-button', n_clicks=0),
-        html.Label('Select Graph Type'),
-        dcc.Dropdown(id='graph-type-dropdown',
-                     options=[
-                         {'label': 'Clean Signal', 'value': 'clean-signal'},
-                         {'label': 'Filtered Signal', 'value': 'filtered-signal'}
-                     ],
-                     value='clean-signal'),
-    ], style={'width': '50%', 'margin': 'auto'}),
-    html.Div(id='selected-graph-container')
-])
+def view(signals, name, x_range=(None, None)):
+    return signals['lod'][name].query(*x_range, width=plot_width)
+
+def line(signals, name, label):
+    x, y = view(signals, name)
+    return go.Scatter(x=x, y=y, mode='lines', name=label)
+
+# Фігури створюються один раз при завантаженні сторінки; далі колбеки
+# надсилають лише видимі точки сигналів через Patch
+def main_figure(signals):
+    fig = go.Figure()
+    fig.add_trace(line(signals, 'noisy', 'Signal with Noise'))
+    fig.add_trace(line(signals, 'clean', 'Clean Signal'))
+    fig.add_trace(line(signals, 'filtered', 'Signal with Filtered Noise'))
+    fig.update_layout(uirevision='signal')
+    return fig
+
+def selected_figure(signals):
+    fig = go.Figure()
+    fig.add_trace(line(signals, 'clean', 'Signal'))
+    fig.update_layout(uirevision='signal')
+    return fig
+
+# Макет створюється для кожного завантаження сторінки, тож кожен користувач
+# отримує власний ідентифікатор сесії і не перезаписує шум інших
+def serve_layout():
+    session_id = str(uuid.uuid4())
+    signals = cached_signals(session_id, initial_amplitude, initial_frequency, initial_phase,
+                             initial_noise_mean, initial_noise_covariance, initial_window)
+    return html.Div([
+        dcc.Store(id='session-id', data=session_id),
+        dcc.Graph(id='graph', figure=main_figure(signals)),
+        html.Div([
+            html.Label('Amplitude'),
+            dcc.Slider(id='amplitude-slider', min=0.1, max=2, step=0.1, value=initial_amplitude),
+            html.Label('Frequency'),
+            dcc.Slider(id='frequency-slider', min=0.1, max=2, step=0.1, value=initial_frequency),
+            html.Label('Phase'),
+            dcc.Slider(id='phase-slider', min=0.0, max=2 * np.pi, step=0.1, value=initial_phase),
+            html.Label('Noise Mean'),
+            dcc.Slider(id='noise-mean-slider', min=-1.0, max=1.0, step=0.1, value=initial_noise_mean),
+            html.Label('Noise Covariance'),
+            dcc.Slider(id='noise-covariance-slider', min=0.1, max=1.0, step=0.1, value=initial_noise_covariance),
+            html.Label('Window'),
+            dcc.Slider(id='window', min=1, max=100, step=1, value=initial_window),
+            html.Label('Show Noise'),
+            dcc.Checklist(id='show-noise-checkbox', options=[{'label': 'Show Noise', 'value': 'show'}], value=['show']),
+            html.Button('Reset', id='reset-button', n_clicks=0),
+            html.Label('Select Graph Type'),
+            dcc.Dropdown(id='graph-type-dropdown',
+                         options=[
+                             {'label': 'Clean Signal', 'value': 'clean-signal'},
+                             {'label': 'Filtered Signal', 'value': 'filtered-signal'}
+                         ],
+                         value='clean-signal'),
+        ], style={'width': '50%', 'margin': 'auto'}),
+        html.Div(dcc.Graph(id='selected-graph', figure=selected_figure(signals)), id='selected-graph-container')
+    ])
+
+app.layout = serve_layout
+
+# Який вхід змінився: зміна масштабу одного графіка оновлює лише цей графік
+# (з новими x), зміна параметрів - обидва (x лише для проріджених ділянок)
+def update_graphs(graph_type, amplitude, frequency, phase, noise_mean, noise_covariance, show_noise, window,
+                  main_relayout=None, selected_relayout=None, session_id=None, triggered=None):
+    signals = cached_signals(session_id, amplitude, frequency, phase, noise_mean, noise_covariance, window)
+    main, selected = dash.no_update, dash.no_update
+    if triggered != 'selected-graph':
+        main = update_graph(signals, show_noise, relayout_range(main_relayout), triggered == 'graph')
+    if triggered != 'graph':
+        selected = display_selected_graph(signals, graph_type, relayout_range(selected_relayout),
+                                          triggered == 'selected-graph')
+    return main, selected
 
 @app.callback(
     Output('graph', 'figure'),
+    Output('selected-graph', 'figure'),
     [
+        Input('graph-type-dropdown', 'value'),
         Input('amplitude-slider', 'value'),
         Input('frequency-slider', 'value'),
         Input('phase-slider', 'value'),
         Input('noise-mean-slider', 'value'),
         Input('noise-covariance-slider', 'value'),
         Input('show-noise-checkbox', 'value'),
-    ]
+        Input('window', 'value'),
+        Input('graph', 'relayoutData'),
+        Input('selected-graph', 'relayoutData'),
+    ],
+    State('session-id', 'data'),
 )
-def update_graph(amplitude, frequency, phase, noise_mean, noise_covariance, show_noise):
-    global previous_noise, previous_noise_mean, previous_noise_covariance
-    
-    # Перевірка, чи параметри шуму змінилися
-    if (noise_mean != previous_noise_mean or
-        noise_covariance != previous_noise_covariance):
-        
-        previous_noise_mean = noise_mean
-        previous_noise_covariance = noise_covariance
-        previous_noise = np.random.normal(noise_mean, np.sqrt(noise_covariance), len(t))
-    
-    noise = previous_noise if 'show' in show_noise else np.zeros(len(t))
-    
-    # Обчислення гармоніки
-    y = amplitude * np.sin(2 * np.pi * frequency * t + phase) + noise
-    
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=t, y=y, mode='lines', name='Signal with Noise' if 'show' in show_noise else 'Signal'))
-    
-    # Додамо графіки сигналу без шуму та відфільтрованого шуму
-    if 'show' in show_noise:
-        clean_signal = amplitude * np.sin(2 * np.pi * frequency * t + phase)
-        fig.add_trace(go.Scatter(x=t, y=clean_signal, mode='lines', name='Clean Signal'))
-        
-        filtered_noise = my_filter(previous_noise)
-        signal_with_filtered_noise = clean_signal + filtered_noise
-        fig.add_trace(go.Scatter(x=t, y=signal_with_filtered_noise, mode='lines', name='Signal with Filtered Noise'))
-    
-    return fig
+def on_change(*args):
+    return update_graphs(*args, triggered=dash.ctx.triggered_id)
 
-@app.callback(
-    Output('selected-graph-container', 'children'),
-    [Input('graph-type-dropdown', 'value'),
-     Input('amplitude-slider', 'value'),
-     Input('frequency-slider', 'value'),
-     Input('phase-slider', 'value'),
-     Input('noise-mean-slider', 'value'),
-     Input('noise-covariance-slider', 'value'),
-     Input('show-noise-checkbox', 'value'),
-     ]
-    
-)
-def display_selected_graph(graph_type, amplitude, frequency, phase, noise_mean, noise_covariance, show_noise):
+# Масив у форматі typed array plotly.js (base64), як і в go.Figure
+def typed_array(values):
+    values = np.ascontiguousarray(values, dtype='<f8')
+    return {'dtype': 'f8', 'bdata': base64.b64encode(values.tobytes()).decode('ascii')}
+
+# Точки сигналу для поточного діапазону осі x (при масштабуванні - дрібніший рівень).
+# x надсилається лише при зміні діапазону або для проріджених точок: інакше
+# браузер уже має ті самі відліки часу
+def set_trace(patch, index, signals, name, x_range, range_changed=False):
+    x, y = view(signals, name, x_range)
+    if range_changed or signals['lod'][name].decimated(*x_range, width=plot_width):
+        patch['data'][index]['x'] = typed_array(x)
+    patch['data'][index]['y'] = typed_array(y)
+
+def update_graph(signals, show_noise, x_range=(None, None), range_changed=False):
+    show = 'show' in show_noise
+    patch = Patch()
+    set_trace(patch, 0, signals, 'noisy' if show else 'clean', x_range, range_changed)
+    patch['data'][0]['name'] = 'Signal with Noise' if show else 'Signal'
+
+    # Додамо графіки сигналу без шуму та відфільтрованого шуму; при зміні
+    # діапазону оновлюються й приховані, щоб їхні x не застаріли
+    patch['data'][1]['visible'] = show
+    patch['data'][2]['visible'] = show
+    if show or range_changed:
+        set_trace(patch, 1, signals, 'clean', x_range, range_changed)
+        set_trace(patch, 2, signals, 'filtered', x_range, range_changed)
+    return patch
+
+def display_selected_graph(signals, graph_type, x_range=(None, None), range_changed=False):
+    patch = Patch()
     if graph_type == 'clean-signal':
-        return dcc.Graph(figure=update_graph(amplitude, frequency, phase, noise_mean, noise_covariance, []))
+        set_trace(patch, 0, signals, 'clean', x_range, range_changed)
+        patch['data'][0]['name'] = 'Signal'
     elif graph_type == 'filtered-signal':
-        return generate_filtered_signal_graph(amplitude, frequency, phase, noise_mean, noise_covariance, show_noise)
-
-def generate_filtered_signal_graph(amplitude, frequency, phase, noise_mean, noise_covariance, show_noise):
-    # Фільтруємо шум
-    filtered_noise = my_filter(previous_noise)
-    # Отримуємо сигнал без шуму
-    clean_signal = amplitude * np.sin(2 * np.pi * frequency * t + phase)
-    # Додаємо до нього відфільтрований шум
-    signal_with_filtered_noise = clean_signal + filtered_noise
-    # Побудова графіку
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=t, y=signal_with_filtered_noise, mode='lines', name='Signal with Filtered Noise'))
-    return dcc.Graph(figure=fig)
+        set_trace(patch, 0, signals, 'filtered', x_range, range_changed)
+        patch['data'][0]['name'] = 'Signal with Filtered Noise'
+    return patch
 
 @app.callback(
     Output('amplitude-slider', 'value'),
@@ -141,13 +205,47 @@ def generate_filtered_signal_graph(amplitude, frequency, phase, noise_mean, nois
     Output('noise-mean-slider', 'value'),
     Output('noise-covariance-slider', 'value'),
     Output('show-noise-checkbox', 'value'),
+    Output('window', 'value'),
     [Input('reset-button', 'n_clicks')]
 )
 def reset_sliders(n_clicks):
     if n_clicks > 0:
-        return initial_amplitude, initial_frequency, initial_phase, initial_noise_mean, initial_noise_covariance, ['show'],
+        return initial_amplitude, initial_frequency, initial_phase, initial_noise_mean, initial_noise_covariance, ['show'], initial_window
     else:
         raise dash.exceptions.PreventUpdate
 
+# Порівняння затримки та розміру відповіді: повні фігури для обох графіків
+# (як було раніше) проти Patch зі спільним кешованим обчисленням
+def benchmark(repeats=20):
+    import json
+    import time
+    from plotly.utils import PlotlyJSONEncoder
+
+    params = [(initial_amplitude + 0.1 * i, initial_frequency, initial_phase,
+               initial_noise_mean, initial_noise_covariance, initial_window) for i in range(repeats)]
+
+    start = time.perf_counter()
+    full_size = 0
+    for amplitude, frequency, phase, noise_mean, noise_covariance, window in params:
+        for _ in range(2):
+            signals = compute_signals('benchmark', amplitude, frequency, phase, noise_mean, noise_covariance, window)
+        full_size += len(main_figure(signals).to_json()) + len(selected_figure(signals).to_json())
+    full_time = (time.perf_counter() - start) / repeats
+
+    start = time.perf_counter()
+    patch_size = 0
+    for amplitude, frequency, phase, noise_mean, noise_covariance, window in params:
+        patches = update_graphs('clean-signal', amplitude, frequency, phase, noise_mean, noise_covariance,
+                                ['show'], window, None, None, 'benchmark')
+        patch_size += len(json.dumps([patch.to_plotly_json() for patch in patches], cls=PlotlyJSONEncoder))
+    patch_time = (time.perf_counter() - start) / repeats
+
+    print(f'Повні фігури: {full_time * 1000:.2f} мс, {full_size / repeats / 1024:.1f} КБ на подію')
+    print(f'Patch + кеш:  {patch_time * 1000:.2f} мс, {patch_size / repeats / 1024:.1f} КБ на подію')
+
 if __name__ == '__main__':
-    app.run_server(debug=True)
\ No newline at end of file
+    import sys
+    if '--benchmark' in sys.argv:
+        benchmark()
+    else:
+        app.run_server(debug=True)
\ No newline at end of file
@@ -0,0 +1,134 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import scipy.signal as sig
+
+from lab5_butterworth import butter_sos
+
+
+# Параметри зводяться до спільної довжини (скаляр розширюється на всі сигнали)
+def broadcast_params(*params):
+    arrays = np.broadcast_arrays(*[np.atleast_1d(np.asarray(p, dtype=float)) for p in params])
+    return [a.ravel() for a in arrays]
+
+
+# Блок гармонік (n_signals x n_samples) одним обчисленням з broadcasting
+def harmonic_batch(t, amplitude, frequency, phase, out=None):
+    amplitude, frequency, phase = broadcast_params(amplitude, frequency, phase)
+    t = np.asarray(t, dtype=float)
+    if out is None:
+        out = np.empty((len(amplitude), len(t)))
+    np.multiply(2 * np.pi * frequency[:, None], t[None, :], out=out)
+    out += phase[:, None]
+    np.sin(out, out=out)
+    out *= amplitude[:, None]
+    return out
+
+
+# Шум для кожного рядка має власний seed (seed, номер рядка), тож результат не
+# залежить від того, як блок поділено між процесами
+def noise_batch(n_samples, noise_mean, noise_covariance, seed=0, rows=None, out=None):
+    noise_mean, noise_covariance = broadcast_params(noise_mean, noise_covariance)
+    if rows is None:
+        rows = range(len(noise_mean))
+    if out is None:
+        out = np.empty((len(rows), n_samples))
+    for i, row in enumerate(rows):
+        np.random.default_rng([seed, row]).standard_normal(n_samples, out=out[i])
+    out *= np.sqrt(noise_covariance)[:, None]
+    out += noise_mean[:, None]
+    return out
+
+
+# Фільтр Баттерворта вздовж axis=-1 для всього блоку; різні частоти зрізу
+# обробляються групами, один виклик sosfiltfilt на групу
+def butterworth_batch(signals, fs, cutoff_freq, order=4, out=None):
+    signals = np.asarray(signals, dtype=float)
+    cutoff = np.broadcast_to(np.asarray(cutoff_freq, dtype=float), signals.shape[:1])
+    if out is None:
+        out = np.empty_like(signals)
+    for value in np.unique(cutoff):
+        rows = cutoff == value
+        sos = butter_sos(order, float(value), float(fs))
+        if rows.all():
+            out[...] = sig.sosfiltfilt(sos, signals, axis=-1)
+        else:
+            out[rows] = sig.sosfiltfilt(sos, signals[rows], axis=-1)
+    return out
+
+
+# Вихідний блок у файлі .npy, що відкривається як memory map
+def open_output(path, shape):
+    return np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=shape)
+
+
+def simulate_rows(t, params, rows, fs, seed, order, noisy, filtered):
+    amplitude, frequency, phase, noise_mean, noise_covariance, cutoff_freq = [p[rows.start:rows.stop] for p in params]
+    block = noisy[rows.start:rows.stop]
+    harmonic_batch(t, amplitude, frequency, phase, out=block)
+    block += noise_batch(len(t), noise_mean, noise_covariance, seed, rows)
+    butterworth_batch(block, fs, cutoff_freq, order, out=filtered[rows.start:rows.stop])
+
+
+def simulate_worker(t, params, rows, fs, seed, order, noisy_path, filtered_path):
+    noisy = np.load(noisy_path, mmap_mode='r+')
+    filtered = np.load(filtered_path, mmap_mode='r+')
+    simulate_rows(t, params, rows, fs, seed, order, noisy, filtered)
+    noisy.flush()
+    filtered.flush()
+
+
+# Зашумлені та відфільтровані сигнали для масивів параметрів. out_dir - каталог
+# для memory-mapped результатів; processes - кількість процесів для великих блоків
+def simulate_batch(t, amplitude, frequency, phase, noise_mean=0.0, noise_covariance=0.1,
+                   fs=1000, cutoff_freq=60.0, seed=0, order=4, out_dir=None, processes=None, chunk_rows=256):
+    t = np.asarray(t, dtype=float)
+    params = broadcast_params(amplitude, frequency, phase, noise_mean, noise_covariance, cutoff_freq)
+    shape = (len(params[0]), len(t))
+    chunks = [range(start, min(start + chunk_rows, shape[0])) for start in range(0, shape[0], chunk_rows)]
+
+    if out_dir is None:
+        if processes:
+            raise ValueError('Для пулу процесів потрібен out_dir (memory-mapped вихід)')
+        noisy, filtered = np.empty(shape), np.empty(shape)
+        for rows in chunks:
+            simulate_rows(t, params, rows, fs, seed, order, noisy, filtered)
+        return noisy, filtered
+
+    os.makedirs(out_dir, exist_ok=True)
+    noisy_path = os.path.join(out_dir, 'noisy.npy')
+    filtered_path = os.path.join(out_dir, 'filtered.npy')
+    noisy, filtered = open_output(noisy_path, shape), open_output(filtered_path, shape)
+    if processes:
+        del noisy, filtered
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = [pool.submit(simulate_worker, t, params, rows, fs, seed, order, noisy_path, filtered_path)
+                       for rows in chunks]
+            for future in futures:
+                future.result()
+        return np.load(noisy_path, mmap_mode='r'), np.load(filtered_path, mmap_mode='r')
+
+    for rows in chunks:
+        simulate_rows(t, params, rows, fs, seed, order, noisy, filtered)
+    noisy.flush()
+    filtered.flush()
+    return noisy, filtered
+
+
+# MSE відфільтрованого сигналу відносно чистої гармоніки для кожного сигналу
+# і кожної частоти зрізу: результат має форму (n_signals, n_cutoffs)
+def cutoff_sweep(t, amplitude, frequency, phase, noise_mean=0.0, noise_covariance=0.1,
+                 cutoffs=(5, 10, 20, 40, 60, 80), fs=1000, seed=0, order=4):
+    t = np.asarray(t, dtype=float)
+    amplitude, frequency, phase, noise_mean, noise_covariance = broadcast_params(
+        amplitude, frequency, phase, noise_mean, noise_covariance)
+    clean = harmonic_batch(t, amplitude, frequency, phase)
+    noisy = clean + noise_batch(len(t), noise_mean, noise_covariance, seed)
+    errors = np.empty((len(amplitude), len(cutoffs)))
+    filtered = np.empty_like(noisy)
+    for j, cutoff in enumerate(cutoffs):
+        butterworth_batch(noisy, fs, cutoff, order, out=filtered)
+        filtered -= clean
+        errors[:, j] = np.mean(filtered ** 2, axis=-1)
+    return errors
@@ -0,0 +1,44 @@
+from functools import lru_cache
+
+import numpy as np
+import scipy.signal as sig
+
+
+# Проєктування фільтра кешується: при зміні амплітуди/фази частота зрізу та сама
+@lru_cache(maxsize=128)
+def butter_sos(order, cutoff_freq, fs, btype='low'):
+    return sig.butter(order, cutoff_freq / (fs / 2), btype=btype, output='sos')
+
+
+# Фільтр Баттерворта з нульовою фазою (як filtfilt), але у формі SOS
+def butterworth_filter(signal, fs, cutoff_freq, order=4, btype='low', axis=-1):
+    return sig.sosfiltfilt(butter_sos(order, float(cutoff_freq), float(fs), btype), signal, axis=axis)
+
+
+# Потокова фільтрація: стан zi зберігається між блоками, тому сигнал, що надходить
+# частинами, не переобробляється з початку. Фільтр причинний (без нульової фази).
+class StreamingButterworth:
+    def __init__(self, fs, cutoff_freq, order=4, btype='low'):
+        self.fs = float(fs)
+        self.order = order
+        self.btype = btype
+        self.cutoff_freq = float(cutoff_freq)
+        self.sos = butter_sos(order, self.cutoff_freq, self.fs, btype)
+        self.zi = None
+
+    def set_cutoff(self, cutoff_freq):
+        # порядок не змінюється, тож стан залишається сумісним з новим фільтром
+        self.cutoff_freq = float(cutoff_freq)
+        self.sos = butter_sos(self.order, self.cutoff_freq, self.fs, self.btype)
+
+    def reset(self):
+        self.zi = None
+
+    def process(self, chunk):
+        chunk = np.asarray(chunk, dtype=float)
+        if len(chunk) == 0:
+            return chunk.copy()
+        if self.zi is None:
+            self.zi = sig.sosfilt_zi(self.sos) * chunk[0]
+        filtered, self.zi = sig.sosfilt(self.sos, chunk, zi=self.zi)
+        return filtered
@@ -0,0 +1,66 @@
+import time
+import threading
+from collections import OrderedDict
+
+
+# LRU-кеш з часом життя записів для серверних обчислень Dash. Крім кількості
+# записів, можна обмежити сумарний розмір (max_bytes, розмір запису - sizeof)
+class TTLCache:
+    def __init__(self, maxsize=128, ttl=300, clock=time.monotonic, max_bytes=None, sizeof=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] < self.clock():
+                if entry is not None:
+                    self.remove(key)
+                self.misses += 1
+                return default
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        size = self.sizeof(value) if self.sizeof is not None else 0
+        with self.lock:
+            if key in self.entries:
+                self.remove(key)
+            self.entries[key] = (self.clock() + self.ttl, value, size)
+            self.nbytes += size
+            self.evict()
+
+    def remove(self, key):
+        self.nbytes -= self.entries.pop(key)[2]
+
+    # Витіснення найдавніше використаних записів; останній доданий залишається
+    def evict(self):
+        while len(self.entries) > 1 and (len(self.entries) > self.maxsize or
+                                         (self.max_bytes is not None and self.nbytes > self.max_bytes)):
+            _, entry = self.entries.popitem(last=False)
+            self.nbytes -= entry[2]
+
+    def get_or_compute(self, key, func, *args):
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = func(*args)
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.nbytes = 0
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,94 @@
+import numpy as np
+import scipy.ndimage as ndi
+import scipy.signal as sig
+
+from timing import timed
+
+
+# Межі вікна такі ж, як у my_filter: [i - half, i + half] з обрізанням на краях
+def window_counts(n, window_size):
+    half = window_size // 2
+    i = np.arange(n)
+    return np.minimum(n, i + half + 1) - np.maximum(0, i - half)
+
+
+# Ковзне середнє через кумулятивну суму, O(n)
+def moving_average(signal, window_size=5, method='cumsum'):
+    signal = np.asarray(signal, dtype=float)
+    n = len(signal)
+    half = window_size // 2
+    if n == 0:
+        return signal.copy()
+    if method == 'convolve':
+        kernel = np.ones(2 * half + 1)
+        sums = np.convolve(signal, kernel, mode='full')[half:half + n]
+        return sums / window_counts(n, window_size)
+
+    csum = np.concatenate(([0.0], np.cumsum(signal)))
+    i = np.arange(n)
+    start = np.maximum(0, i - half)
+    end = np.minimum(n, i + half + 1)
+    return (csum[end] - csum[start]) / (end - start)
+
+
+# Ковзна медіана; на краях вікно обрізається так само, як у середньому
+def moving_median(signal, window_size=5):
+    signal = np.asarray(signal, dtype=float)
+    n = len(signal)
+    half = window_size // 2
+    result = ndi.median_filter(signal, size=2 * half + 1, mode='nearest')
+    for i in list(range(min(half, n))) + list(range(max(half, n - half), n)):
+        result[i] = np.median(signal[max(0, i - half):min(n, i + half + 1)])
+    return result
+
+
+# Експоненційне згладжування, alpha за замовчуванням відповідає довжині вікна
+def exponential_smoothing(signal, window_size=5, alpha=None):
+    signal = np.asarray(signal, dtype=float)
+    if len(signal) == 0:
+        return signal.copy()
+    if alpha is None:
+        alpha = 2 / (window_size + 1)
+    filtered, _ = sig.lfilter([alpha], [1, alpha - 1], signal, zi=[(1 - alpha) * signal[0]])
+    return filtered
+
+
+filters = {
+    'mean': moving_average,
+    'median': moving_median,
+    'exponential': exponential_smoothing,
+}
+
+
+def apply_filter(signal, window_size=5, kind='mean'):
+    return filters[kind](signal, window_size)
+
+
+# Поточна реалізація з lab5_2.py, залишена для порівняння
+def my_filter(signal, window_size=5):
+    filtered_signal = np.zeros_like(signal)
+    half_window = window_size // 2
+
+    for i in range(len(signal)):
+        start = max(0, i - half_window)
+        end = min(len(signal), i + half_window + 1)
+        filtered_signal[i] = np.mean(signal[start:end])
+
+    return filtered_signal
+
+
+def benchmark(sizes=(10**3, 10**4, 10**5, 10**6, 10**7), window_size=10, legacy_limit=10**5):
+    rng = np.random.default_rng(0)
+    print(f'{"n":>10} {"my_filter":>10} {"cumsum":>10} {"convolve":>10} {"median":>10} {"exp":>10}')
+    for n in sizes:
+        signal = rng.normal(size=n)
+        legacy = f'{timed(my_filter, signal, window_size)[1]:10.4f}' if n <= legacy_limit else f'{"-":>10}'
+        print(f'{n:>10} {legacy} '
+              f'{timed(moving_average, signal, window_size)[1]:10.4f} '
+              f'{timed(moving_average, signal, window_size, "convolve")[1]:10.4f} '
+              f'{timed(moving_median, signal, window_size)[1]:10.4f} '
+              f'{timed(exponential_smoothing, signal, window_size)[1]:10.4f}')
+
+
+if __name__ == '__main__':
+    benchmark()
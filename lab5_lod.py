@@ -0,0 +1,102 @@
+import numpy as np
+
+
+# Піраміда min/max: рівень k зберігає мінімум і максимум (та їхні позиції) для
+# блоків по 2**k відліків; будується за O(n), бо кожен рівень - з попереднього
+class LODSignal:
+    def __init__(self, x, y):
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.levels = []
+        # позиції зберігаються в int32, поки їх вистачає (удвічі менше пам'яті)
+        index = np.arange(len(self.y), dtype=np.int32 if len(self.y) < 2**31 else np.int64)
+        lo_idx, hi_idx = index, index
+        while len(lo_idx) > 1:
+            lo_idx, hi_idx = self.merge(lo_idx, hi_idx)
+            self.levels.append((lo_idx, hi_idx))
+
+    def merge(self, lo_idx, hi_idx):
+        if len(lo_idx) % 2:
+            lo_idx = np.append(lo_idx, lo_idx[-1])
+            hi_idx = np.append(hi_idx, hi_idx[-1])
+        left_lo, right_lo = lo_idx[0::2], lo_idx[1::2]
+        left_hi, right_hi = hi_idx[0::2], hi_idx[1::2]
+        lo = np.where(self.y[right_lo] < self.y[left_lo], right_lo, left_lo)
+        hi = np.where(self.y[right_hi] > self.y[left_hi], right_hi, left_hi)
+        return lo, hi
+
+    # Пам'ять піраміди разом з y (x спільний для сигналів і не враховується)
+    @property
+    def nbytes(self):
+        return self.y.nbytes + sum(lo.nbytes + hi.nbytes for lo, hi in self.levels)
+
+    def bounds(self, x0=None, x1=None):
+        start = 0 if x0 is None else int(np.searchsorted(self.x, x0, side='left'))
+        stop = len(self.x) if x1 is None else int(np.searchsorted(self.x, x1, side='right'))
+        # захоплюємо по одній точці за межами, щоб лінія доходила до краю
+        return max(0, start - 1), min(len(self.x), stop + 1)
+
+    # Чи проріджується видимий діапазон (інакше query повертає відліки як є)
+    def decimated(self, x0=None, x1=None, width=1000):
+        start, stop = self.bounds(x0, x1)
+        return stop - start > 2 * width
+
+    # Точки для видимого діапазону [x0, x1] і ширини в пікселях: не більше
+    # ~2*width точок, мінімуми й максимуми блоків ідуть у порядку часу
+    def query(self, x0=None, x1=None, width=1000):
+        start, stop = self.bounds(x0, x1)
+        count = stop - start
+        if count <= 2 * width:
+            return self.x[start:stop], self.y[start:stop]
+
+        level = max(0, int(np.ceil(np.log2(count / width))) - 1)
+        level = min(level, len(self.levels) - 1)
+        block = 2 ** (level + 1)
+        lo_idx, hi_idx = self.levels[level]
+        first, last = start // block, min(len(lo_idx), -(-stop // block))
+        lo, hi = lo_idx[first:last], hi_idx[first:last]
+        index = np.empty(2 * len(lo), dtype=np.int64)
+        index[0::2] = np.minimum(lo, hi)
+        index[1::2] = np.maximum(lo, hi)
+        return self.x[index], self.y[index]
+
+
+# Лінія matplotlib, що перезапитує піраміду при зміні меж осі x. Піраміда
+# будується ззовні (напр. етапом RecomputeGraph), тож її можна ділити між лініями
+class LODLine:
+    def __init__(self, ax, line, lod, width=None):
+        self.ax = ax
+        self.line = line
+        self.width = width
+        self.lod = lod
+        ax.callbacks.connect('xlim_changed', lambda ax: self.refresh())
+        self.refresh()
+
+    def pixel_width(self):
+        if self.width is not None:
+            return self.width
+        return max(100, int(self.ax.get_window_extent().width))
+
+    def set_signal(self, lod):
+        if lod is self.lod:
+            return
+        self.lod = lod
+        self.refresh()
+
+    def refresh(self):
+        x0, x1 = self.ax.get_xlim()
+        self.line.set_data(*self.lod.query(x0, x1, self.pixel_width()))
+
+    def set_visible(self, visible):
+        self.line.set_visible(visible)
+
+
+# Межі осі x з relayoutData графіка Dash (None - весь діапазон)
+def relayout_range(relayout_data, axis='xaxis'):
+    if not relayout_data or relayout_data.get(f'{axis}.autorange'):
+        return None, None
+    if f'{axis}.range[0]' in relayout_data:
+        return relayout_data[f'{axis}.range[0]'], relayout_data[f'{axis}.range[1]']
+    if f'{axis}.range' in relayout_data:
+        return tuple(relayout_data[f'{axis}.range'])
+    return None, None
@@ -0,0 +1,53 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+# Банк шуму: для кожної пари (сесія, seed, довжина) зберігається один стандартний
+# нормальний вектор, а шум з будь-якими середнім і дисперсією отримується з нього
+# афінним перетворенням без нового виклику генератора
+class NoiseBank:
+    def __init__(self, max_bytes=256 * 2**20, max_entries=64):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.bases = OrderedDict()
+        self.nbytes = 0
+        self.lock = threading.Lock()
+
+    def base(self, session, length, seed=0):
+        key = (session, seed, length)
+        with self.lock:
+            if key in self.bases:
+                self.bases.move_to_end(key)
+                return self.bases[key]
+        values = np.random.default_rng(seed).standard_normal(length)
+        values.setflags(write=False)
+        with self.lock:
+            if key not in self.bases:
+                self.bases[key] = values
+                self.nbytes += values.nbytes
+                self.evict()
+            return self.bases[key]
+
+    # Витіснення найдавніше використаних векторів (LRU) при перевищенні ліміту
+    def evict(self):
+        while len(self.bases) > 1 and (self.nbytes > self.max_bytes or len(self.bases) > self.max_entries):
+            _, values = self.bases.popitem(last=False)
+            self.nbytes -= values.nbytes
+
+    def noise(self, session, length, mean=0.0, variance=1.0, seed=0, out=None):
+        base = self.base(session, length, seed)
+        if out is None:
+            out = np.empty(length)
+        np.multiply(base, np.sqrt(variance), out=out)
+        out += mean
+        return out
+
+    def drop(self, session):
+        with self.lock:
+            for key in [key for key in self.bases if key[0] == session]:
+                self.nbytes -= self.bases.pop(key).nbytes
+
+
+noise_bank = NoiseBank()
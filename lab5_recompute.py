@@ -0,0 +1,62 @@
+# Граф обчислень з мемоізацією: кожен етап перераховується лише тоді, коли змінилися
+# параметри, від яких він залежить, або результати попередніх етапів
+
+
+class Stage:
+    def __init__(self, func, params=(), inputs=()):
+        self.func = func
+        self.params = tuple(params)
+        self.inputs = tuple(inputs)
+        self.key = None
+        self.value = None
+        self.version = 0
+
+
+class RecomputeGraph:
+    def __init__(self, **params):
+        self.params = dict(params)
+        self.stages = {}
+
+    def stage(self, name, func, params=(), inputs=()):
+        self.stages[name] = Stage(func, params, inputs)
+        return self
+
+    def update(self, **params):
+        self.params.update(params)
+
+    # Ключ етапу: значення його параметрів та версії вхідних етапів
+    def key(self, stage):
+        return (tuple(self.params[p] for p in stage.params),
+                tuple(self.compute(name).version for name in stage.inputs))
+
+    def compute(self, name):
+        stage = self.stages[name]
+        key = self.key(stage)
+        if key != stage.key:
+            args = [self.params[p] for p in stage.params] + [self.stages[i].value for i in stage.inputs]
+            stage.value = stage.func(*args)
+            stage.key = key
+            stage.version += 1
+        return stage
+
+    def __getitem__(self, name):
+        return self.compute(name).value
+
+
+# Об'єднання серії подій слайдера в одне перемальовування через таймер matplotlib
+class RedrawCoalescer:
+    def __init__(self, canvas, redraw, interval=30):
+        self.redraw = redraw
+        self.pending = False
+        self.timer = canvas.new_timer(interval=interval)
+        self.timer.single_shot = True
+        self.timer.add_callback(self.fire)
+
+    def request(self):
+        if not self.pending:
+            self.pending = True
+            self.timer.start()
+
+    def fire(self):
+        self.pending = False
+        self.redraw()
@@ -0,0 +1,210 @@
+import numpy as np
+
+from timing import timed
+
+
+# Достатні статистики простої регресії y = kx + b: n, Σx, Σy, Σxy, Σx², Σy².
+# Частини даних (або окремі накопичувачі) додаються, а MSE і градієнт для будь-яких
+# (k, b) обчислюються з них за O(1), без проходу по точках
+class LinearStats:
+    def __init__(self):
+        self.n = 0
+        self.sx = self.sy = self.sxy = self.sxx = self.syy = 0.0
+
+    def update(self, xx, yy):
+        xx = np.asarray(xx, dtype=np.float64)
+        yy = np.asarray(yy, dtype=np.float64)
+        self.n += len(xx)
+        self.sx += xx.sum()
+        self.sy += yy.sum()
+        self.sxy += xx @ yy
+        self.sxx += xx @ xx
+        self.syy += yy @ yy
+        return self
+
+    def merge(self, other):
+        self.n += other.n
+        self.sx += other.sx
+        self.sy += other.sy
+        self.sxy += other.sxy
+        self.sxx += other.sxx
+        self.syy += other.syy
+        return self
+
+    # Метод найменших квадратів у замкненій формі (як least_squares_estimate)
+    def solve(self):
+        k = (self.n * self.sxy - self.sx * self.sy) / (self.n * self.sxx - self.sx ** 2)
+        b = (self.sy - k * self.sx) / self.n
+        return float(k), float(b)
+
+    def loss(self, k, b):
+        return (self.syy - 2 * k * self.sxy - 2 * b * self.sy + k * k * self.sxx
+                + 2 * k * b * self.sx + self.n * b * b) / self.n
+
+    def gradient(self, k, b):
+        return (2 / self.n * (k * self.sxx + b * self.sx - self.sxy),
+                2 / self.n * (k * self.sx + self.n * b - self.sy))
+
+
+def fit_stats(xx, yy, chunk_size=1 << 20):
+    stats = LinearStats()
+    for start in range(0, len(xx), chunk_size):
+        stats.update(xx[start:start + chunk_size], yy[start:start + chunk_size])
+    return stats
+
+
+def least_squares(xx, yy):
+    return fit_stats(xx, yy).solve()
+
+
+# Статистики міні-батчів: точки перемішуються один раз (seed), кожен батч
+# отримує власні суми, тож крок SGD коштує O(1)
+def batch_stats(xx, yy, batch_size, seed=0):
+    xx = np.asarray(xx, dtype=np.float64)
+    yy = np.asarray(yy, dtype=np.float64)
+    order = np.random.default_rng(seed).permutation(len(xx))
+    x, y = xx[order], yy[order]
+    starts = np.arange(0, len(x), batch_size)
+    batches = [np.add.reduceat(values, starts) for values in (x, y, x * y, x * x, y * y)]
+    n = np.diff(np.append(starts, len(x)))
+    result = []
+    for i in range(len(starts)):
+        stats = LinearStats()
+        stats.n = int(n[i])
+        stats.sx, stats.sy, stats.sxy, stats.sxx, stats.syy = (float(b[i]) for b in batches)
+        result.append(stats)
+    return result
+
+
+class Fit:
+    def __init__(self, k, b, losses, converged):
+        self.k, self.b = k, b
+        self.losses = losses
+        self.iterations = len(losses)
+        self.converged = converged
+
+
+# Градієнтний спуск за статистиками: method - 'gd', 'momentum' або 'adam';
+# batches (з batch_stats) дає міні-батчевий / стохастичний варіант. Зупинка - коли
+# норма повного градієнта менша за tol (або втрата стала нескінченною)
+def minimize(stats, method='gd', learning_rate=0.01, init=(0.0, 0.0), tol=1e-6, max_iter=100_000,
+             batches=None, decay=0.0, beta=0.9, beta2=0.999, eps=1e-8):
+    k, b = init
+    velocity_k = velocity_b = 0.0
+    square_k = square_b = 0.0
+    losses = []
+    converged = False
+    for t in range(max_iter):
+        loss = stats.loss(k, b)
+        losses.append(loss)
+        full_k, full_b = stats.gradient(k, b)
+        if not np.isfinite(loss):
+            break
+        if np.hypot(full_k, full_b) < tol:
+            converged = True
+            break
+
+        if batches is None:
+            grad_k, grad_b = full_k, full_b
+        else:
+            grad_k, grad_b = batches[t % len(batches)].gradient(k, b)
+        rate = learning_rate / (1 + decay * t)
+
+        if method == 'momentum':
+            velocity_k = beta * velocity_k + grad_k
+            velocity_b = beta * velocity_b + grad_b
+            k -= rate * velocity_k
+            b -= rate * velocity_b
+        elif method == 'adam':
+            velocity_k = beta * velocity_k + (1 - beta) * grad_k
+            velocity_b = beta * velocity_b + (1 - beta) * grad_b
+            square_k = beta2 * square_k + (1 - beta2) * grad_k ** 2
+            square_b = beta2 * square_b + (1 - beta2) * grad_b ** 2
+            correction = np.sqrt(1 - beta2 ** (t + 1)) / (1 - beta ** (t + 1))
+            k -= rate * correction * velocity_k / (np.sqrt(square_k) + eps)
+            b -= rate * correction * velocity_b / (np.sqrt(square_b) + eps)
+        else:
+            k -= rate * grad_k
+            b -= rate * grad_b
+    return Fit(k, b, losses, converged)
+
+
+# Порядок позиційних параметрів як у lab6.ipynb (learning_rate, n_iter); tol тут -
+# поріг норми градієнта, а не втрати, тому tol і method лише іменовані
+def gradient_descent(xx, yy, learning_rate=0.01, n_iter=1000, *, tol=1e-6, method='gd'):
+    fit = minimize(fit_stats(xx, yy), method, learning_rate, tol=tol, max_iter=n_iter)
+    return fit.k, fit.b
+
+
+def generate_points(kk=3, bb=8, num_points=100, seed=0, sigma=2):
+    rng = np.random.default_rng(seed)
+    xx = rng.uniform(0, 10, num_points)
+    yy = kk * xx + bb + rng.normal(0, sigma, num_points)
+    return xx, yy
+
+
+# Поточні реалізації з lab6.ipynb, залишені для порівняння
+def least_squares_estimate(xx, yy):
+    n = len(xx)
+
+    sum_xx = np.sum(xx)
+    sum_yy = np.sum(yy)
+    sum_xy = np.sum(xx * yy)
+    sum_xx_squared = np.sum(xx**2)
+
+    k_hat = (n * sum_xy - sum_xx * sum_yy) / (n * sum_xx_squared - sum_xx**2)
+    b_hat = (sum_yy - k_hat * sum_xx) / n
+
+    return k_hat, b_hat
+
+
+def mean_squared_error(y_true, y_pred):
+    return np.mean((y_true - y_pred)**2)
+
+
+def gradient_descent_with_error(xx, yy, learning_rate=0.01, n_iter=1000, tol=1e-6):
+    k = 0
+    b = 0
+    n = len(xx)
+
+    errors = []
+
+    for _ in range(n_iter):
+
+        y_pred = k * xx + b
+
+        loss = mean_squared_error(yy, y_pred)
+        errors.append(loss)
+
+        if loss < tol:
+            break
+
+        grad_k = -(2/n) * np.sum(xx * (yy - y_pred))
+        grad_b = -(2/n) * np.sum(yy - y_pred)
+
+        k -= learning_rate * grad_k
+        b -= learning_rate * grad_b
+
+    return errors
+
+
+def benchmark(num_points=1_000_000, n_iter=1000):
+    xx, yy = generate_points(num_points=num_points)
+    old_errors, old_time = timed(gradient_descent_with_error, xx, yy, 0.01, n_iter)
+    stats, stats_time = timed(fit_stats, xx, yy)
+    fit, fit_time = timed(minimize, stats, 'gd', 0.01, max_iter=n_iter, tol=0)
+    assert np.allclose(fit.losses, old_errors)
+
+    print(f'{n_iter} ітерацій на {num_points} точках: по точках {old_time:.2f} с -> '
+          f'статистики {stats_time * 1000:.1f} мс + спуск {fit_time * 1000:.1f} мс')
+    print(f'Замкнена форма: k, b = {stats.solve()}')
+    for method, rate in [('gd', 0.02), ('momentum', 0.005), ('adam', 0.5)]:
+        fit = minimize(stats, method, rate)
+        print(f'{method:8}: k = {fit.k:.4f}, b = {fit.b:.4f}, ітерацій {fit.iterations}, збіжність {fit.converged}')
+    batches = batch_stats(xx, yy, 1024)
+    fit = minimize(stats, 'adam', 0.1, batches=batches, decay=1e-3, tol=1e-3)
+    print(f'adam, міні-батчі 1024: k = {fit.k:.4f}, b = {fit.b:.4f}, ітерацій {fit.iterations}')
+
+
+if __name__ == '__main__':
+    benchmark()
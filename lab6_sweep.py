@@ -0,0 +1,130 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from lab6_regression import LinearStats, fit_stats, minimize, generate_points
+from timing import timed
+
+
+# Сітка конфігурацій: кожна пара (learning_rate, початкова точка) - окремий рядок
+def grid(learning_rates, inits=((0.0, 0.0),)):
+    learning_rates = np.asarray(learning_rates, dtype=np.float64)
+    inits = np.asarray(inits, dtype=np.float64).reshape(-1, 2)
+    rate = np.repeat(learning_rates, len(inits))
+    init_k = np.tile(inits[:, 0], len(learning_rates))
+    init_b = np.tile(inits[:, 1], len(learning_rates))
+    return rate, init_k, init_b
+
+
+class Sweep:
+    def __init__(self, rate, init_k, init_b, k, b, losses, iterations, converged, diverged):
+        self.rate, self.init_k, self.init_b = rate, init_k, init_b
+        self.k, self.b = k, b
+        # криві втрат (n_configs x max_iter); після зупинки конфігурації - NaN
+        self.losses = losses
+        self.iterations = iterations
+        self.converged = converged
+        self.diverged = diverged
+
+    # Конфігурація, що збіглася за найменшу кількість ітерацій (оптимальні
+    # learning_rate і n_iter); None, якщо жодна не збіглася
+    def best(self):
+        if not self.converged.any():
+            return None
+        candidates = np.flatnonzero(self.converged)
+        return int(candidates[np.argmin(self.iterations[candidates])])
+
+
+# Градієнтний спуск для всіх конфігурацій одночасно: (k, b) - вектори, втрата і
+# градієнт обчислюються з LinearStats за O(1) на конфігурацію. Конфігурація
+# зупиняється, коли норма градієнта менша за tol або втрата стала нескінченною;
+# далі обчислюються лише активні (маска)
+def sweep_rows(stats, rate, init_k, init_b, tol=1e-6, max_iter=10_000, method='gd', beta=0.9, curves=True):
+    n_configs = len(rate)
+    k, b = init_k.astype(np.float64), init_b.astype(np.float64)
+    velocity_k, velocity_b = np.zeros(n_configs), np.zeros(n_configs)
+    losses = np.full((n_configs, max_iter), np.nan) if curves else None
+    iterations = np.full(n_configs, max_iter, dtype=np.int64)
+    converged = np.zeros(n_configs, dtype=bool)
+    diverged = np.zeros(n_configs, dtype=bool)
+    active = np.arange(n_configs)
+
+    with np.errstate(over='ignore', invalid='ignore'):
+        for t in range(max_iter):
+            ka, ba = k[active], b[active]
+            loss = stats.loss(ka, ba)
+            grad_k, grad_b = stats.gradient(ka, ba)
+            if curves:
+                losses[active, t] = loss
+
+            done = np.hypot(grad_k, grad_b) < tol
+            failed = ~np.isfinite(loss)
+            stop = done | failed
+            if stop.any():
+                converged[active[done]] = True
+                diverged[active[failed]] = True
+                iterations[active[stop]] = t + 1
+                keep = ~stop
+                active = active[keep]
+                ka, ba, grad_k, grad_b = ka[keep], ba[keep], grad_k[keep], grad_b[keep]
+                if len(active) == 0:
+                    break
+
+            step = rate[active]
+            if method == 'momentum':
+                velocity_k[active] = beta * velocity_k[active] + grad_k
+                velocity_b[active] = beta * velocity_b[active] + grad_b
+                grad_k, grad_b = velocity_k[active], velocity_b[active]
+            k[active] = ka - step * grad_k
+            b[active] = ba - step * grad_b
+    return k, b, losses, iterations, converged, diverged
+
+
+def sweep_worker(stats, rows, rate, init_k, init_b, tol, max_iter, method, beta, curves):
+    return sweep_rows(stats, rate[rows], init_k[rows], init_b[rows], tol, max_iter, method, beta, curves)
+
+
+# Перебір learning_rate і початкових точок. stats - LinearStats (або пара xx, yy);
+# processes розподіляє групи по chunk_configs конфігурацій між процесами
+def sweep(stats, learning_rates, inits=((0.0, 0.0),), tol=1e-6, max_iter=10_000, method='gd', beta=0.9,
+          curves=True, processes=None, chunk_configs=4096):
+    if not isinstance(stats, LinearStats):
+        stats = fit_stats(*stats)
+    rate, init_k, init_b = grid(learning_rates, inits)
+    chunks = [slice(start, start + chunk_configs) for start in range(0, len(rate), chunk_configs)]
+    args = (tol, max_iter, method, beta, curves)
+    if processes and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            parts = list(pool.map(sweep_worker, *zip(*[(stats, rows, rate, init_k, init_b) + args
+                                                        for rows in chunks])))
+    else:
+        parts = [sweep_worker(stats, rows, rate, init_k, init_b, *args) for rows in chunks]
+
+    k, b, losses, iterations, converged, diverged = (
+        np.concatenate([part[i] for part in parts]) if parts[0][i] is not None else None for i in range(6))
+    return Sweep(rate, init_k, init_b, k, b, losses, iterations, converged, diverged)
+
+
+def benchmark(num_points=100, max_iter=10_000):
+    xx, yy = generate_points(num_points=num_points)
+    stats = fit_stats(xx, yy)
+    rates = np.geomspace(1e-4, 5e-2, 40)
+    inits = [(0.0, 0.0), (5.0, 0.0), (0.0, 20.0), (-3.0, -8.0)]
+
+    with np.errstate(over='ignore', invalid='ignore'):
+        loop, loop_time = timed(lambda: [minimize(stats, 'gd', r, (k0, b0), max_iter=max_iter)
+                                         for r in rates for k0, b0 in inits])
+    result, sweep_time = timed(sweep, stats, rates, inits, max_iter=max_iter)
+    assert np.array_equal(result.iterations, [fit.iterations for fit in loop])
+    assert np.allclose(result.k, [fit.k for fit in loop], equal_nan=True)
+
+    best = result.best()
+    print(f'{len(result.rate)} конфігурацій: по одній {loop_time * 1000:.0f} мс -> вектором {sweep_time * 1000:.0f} мс')
+    print(f'Збіглися {result.converged.sum()}, розбіглися {result.diverged.sum()}, '
+          f'не збіглися за {max_iter} ітерацій {(~result.converged & ~result.diverged).sum()}')
+    print(f'Найкраща: learning_rate = {result.rate[best]:.4g}, init = ({result.init_k[best]}, '
+          f'{result.init_b[best]}), n_iter = {result.iterations[best]}, k = {result.k[best]:.4f}, b = {result.b[best]:.4f}')
+
+
+if __name__ == '__main__':
+    benchmark()
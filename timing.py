@@ -0,0 +1,24 @@
+import time
+import tracemalloc
+
+
+# Спільні вимірювання для бенчмарків: час виконання і пік пам'яті (tracemalloc)
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def peak_memory(func, *args, **kwargs):
+    tracemalloc.start()
+    func(*args, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+# Час - із запуску без tracemalloc (він у рази сповільнює код з багатьма
+# алокаціями), пік пам'яті - з окремого запуску під tracemalloc
+def measure(func, *args, **kwargs):
+    result, elapsed = timed(func, *args, **kwargs)
+    return result, elapsed, peak_memory(func, *args, **kwargs)